@@ -4,6 +4,7 @@ Dynamic settings loaded from environment variables.
 All values come from environment variables with sensible defaults.
 """
 from __future__ import annotations
+from functools import lru_cache
 from pathlib import Path
 from typing import List
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -19,6 +20,7 @@ class Settings(BaseSettings):
         env_file_encoding="utf-8",
         case_sensitive=False,
         extra="ignore",
+        frozen=True,
     )
 
     # ── App ──────────────────────────────────────────────────
@@ -35,6 +37,7 @@ class Settings(BaseSettings):
         default="http://localhost:3000,http://localhost:5173",
         alias="CORS_ORIGINS"
     )
+    upload_max_mb: int = Field(default=10, alias="UPLOAD_MAX_MB")
 
     @property
     def cors_origins_list(self) -> List[str]:
@@ -47,6 +50,15 @@ class Settings(BaseSettings):
     ai_temperature: float = Field(default=0.3, alias="AI_TEMPERATURE")
     ai_max_tokens: int = Field(default=2048, alias="AI_MAX_TOKENS")
     ai_timeout: int = Field(default=30, alias="AI_TIMEOUT")
+    groq_max_concurrency: int = Field(default=16, alias="GROQ_MAX_CONCURRENCY")
+    llm_cache_enabled: bool = Field(default=True, alias="LLM_CACHE_ENABLED")
+    llm_cache_size: int = Field(default=1024, alias="LLM_CACHE_SIZE")
+    stream_flush_chars: int = Field(default=64, alias="STREAM_FLUSH_CHARS")  # 1 = flush every token
+    groq_rps: float = Field(default=10.0, alias="GROQ_RPS")
+    hf_rps: float = Field(default=5.0, alias="HF_RPS")
+    api_max_retries: int = Field(default=3, alias="API_MAX_RETRIES")
+    api_retry_base_delay: float = Field(default=0.5, alias="API_RETRY_BASE_DELAY")
+    api_retry_jitter: float = Field(default=0.25, alias="API_RETRY_JITTER")
 
     # ── Database ─────────────────────────────────────────────
     sqlite_path: str = Field(default="data/echo_career.db", alias="SQLITE_PATH")
@@ -55,6 +67,18 @@ class Settings(BaseSettings):
     vector_store_path: str = Field(default="data/vector_store", alias="VECTOR_STORE_PATH")
     vector_store_type: str = Field(default="faiss", alias="VECTOR_STORE_TYPE")
     embedding_dim: int = Field(default=768, alias="EMBEDDING_DIM")
+    embed_cache_size: int = Field(default=4096, alias="EMBED_CACHE_SIZE")
+    embed_concurrency: int = Field(default=4, alias="EMBED_CONCURRENCY")
+    hnsw_threshold: int = Field(default=1000, alias="HNSW_THRESHOLD")  # below this, exact search
+    faiss_flat_fp16: bool = Field(default=True, alias="FAISS_FLAT_FP16")  # exact index stores fp16
+    hnsw_m: int = Field(default=32, alias="HNSW_M")
+    hnsw_ef_construction: int = Field(default=80, alias="HNSW_EF_CONSTRUCTION")
+    hnsw_ef_search: int = Field(default=64, alias="HNSW_EF_SEARCH")
+    # index_factory spec used once past hnsw_threshold; "" = HNSW{hnsw_m} flat fp32.
+    # "{m}" expands to hnsw_m, "{nlist}" to sqrt(N), e.g. "IVF{nlist},PQ32" for
+    # very large corpora. Default stores vectors as int8 (SQ8): 4x less memory.
+    faiss_index_spec: str = Field(default="HNSW{m}_SQ8", alias="FAISS_INDEX_SPEC")
+    ivf_nprobe: int = Field(default=16, alias="IVF_NPROBE")
 
     # ── Matching ─────────────────────────────────────────────
     match_threshold: float = Field(default=0.55, alias="MATCH_THRESHOLD")
@@ -67,6 +91,7 @@ class Settings(BaseSettings):
     scrape_delay_seconds: int = Field(default=3, alias="SCRAPE_DELAY_SECONDS")
     scrape_max_retries: int = Field(default=2, alias="SCRAPE_MAX_RETRIES")
     scrape_random_delay: bool = Field(default=True, alias="SCRAPE_RANDOM_DELAY")
+    scrape_concurrency: int = Field(default=3, alias="SCRAPE_CONCURRENCY")  # in-flight requests per source
     agent_loop_hours: int = Field(default=6, alias="AGENT_LOOP_HOURS")
 
     # ── Candidate ────────────────────────────────────────────
@@ -112,11 +137,7 @@ class Settings(BaseSettings):
         return p
 
 
-# Singleton
-_settings: Settings | None = None
-
+# Singleton — lru_cache guarantees a single parse, even across threads
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
-    global _settings
-    if _settings is None:
-        _settings = Settings()
-    return _settings
+    return Settings()
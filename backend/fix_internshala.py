@@ -7,29 +7,39 @@ import sqlite3
 # Ensure imports work
 sys.path.append(os.getcwd())
 
-from src.agent.memory.database import Database
-from src.agent.scrapers.job_scraper import ScraperOrchestrator
-from src.agent.tools.job_matcher import JobMatcher
+from src.agent.registry import get_scraper, get_matcher
 
 async def main():
     print("Cleaning up bad Internshala jobs...")
-    with sqlite3.connect("data/echo_career.db") as conn:
-        # Delete jobs with the generic link
-        cursor = conn.execute("DELETE FROM jobs WHERE source='internshala' AND apply_url LIKE 'https://internshala.com/jobs%'")
+    conn = sqlite3.connect("data/echo_career.db", isolation_level=None)
+    try:
+        conn.execute("PRAGMA foreign_keys=ON")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_source_url ON jobs(source, apply_url)")
+        # One transaction: delete jobs with the generic fallback link (exact
+        # match, served by the index) plus any matches left orphaned by them.
+        conn.execute("BEGIN IMMEDIATE")
+        cursor = conn.execute(
+            "DELETE FROM jobs WHERE source='internshala' AND apply_url=?",
+            ("https://internshala.com/jobs",)
+        )
         print(f"Deleted {cursor.rowcount} bad jobs.")
-        
-        # Also delete matches for those jobs (cascade should handle it, but good to be safe/check)
-        # SQLite with PRAGMA foreign_keys=ON should handle cascade if configured
-        conn.commit()
+        conn.execute("DELETE FROM job_matches WHERE job_id NOT IN (SELECT id FROM jobs)")
+        conn.execute("COMMIT")
+    except Exception:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        raise
+    finally:
+        conn.close()
 
     print("Running scraper for new jobs...")
-    orchestrator = ScraperOrchestrator()
+    orchestrator = get_scraper()
     # We only want to run Internshala if possible, but run_all runs all. 
     # That's fine.
     await orchestrator.run_all()
     
     print("Running matcher...")
-    matcher = JobMatcher()
+    matcher = get_matcher()
     await matcher.run()
     
     print("Done!")
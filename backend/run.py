@@ -9,7 +9,6 @@ Usage (run from backend/ directory):
 """
 import sys
 import asyncio
-from pathlib import Path
 
 
 def start_api():
@@ -31,59 +30,67 @@ def start_api():
 
 async def run_agent():
     """Start autonomous agent loop."""
-    from src.agent.brain.groq_client import GroqClient
-    from src.agent.scrapers.job_scraper import ScraperOrchestrator
-    from src.agent.tools.job_matcher import JobMatcher
-    from src.agent.tools.resume_analyzer import ResumeAnalyzer
-    from src.agent.tools.linkedin_generator import LinkedInGenerator
-    from src.agent.memory.database import Database
+    from src.agent.registry import get_db, get_scraper, get_matcher, get_post_gen
+    from src.agent.brain.logger import get_logger
+    from src.agent.brain.ratelimit import UpstreamUnavailable
     from config.settings import get_settings
+    from datetime import datetime
     import time
 
-    print("\n✦ Echo Autonomous Agent starting...")
+    logger = get_logger("agent")
+    logger.info("✦ Echo Autonomous Agent starting...")
     s = get_settings()
-    db = Database()
-    scraper = ScraperOrchestrator()
-    matcher = JobMatcher()
-    analyzer = ResumeAnalyzer()
-    post_gen = LinkedInGenerator()
-    groq = GroqClient()
+    db = get_db()
+    scraper = get_scraper()
+    matcher = get_matcher()
+    post_gen = get_post_gen()
 
-    print(f"  Model: {groq.model}")
+    logger.info("Model: %s", s.ai_model)
 
     resume = db.get_active_resume()
     if not resume:
-        print("  ⚠️  No resume found. Upload via the web UI first.")
+        logger.warning("⚠️  No resume found. Upload via the web UI first.")
     else:
-        print(f"  Resume: {resume.get('filename','unknown')} | Skills: {len(resume.get('skills',[]))}")
+        logger.info("Resume: %s | Skills: %d", resume.get('filename','unknown'), len(resume.get('skills',[])))
 
     interval = s.agent_loop_hours * 3600
-    print(f"  Loop interval: {s.agent_loop_hours}h\n")
+    logger.info("Loop interval: %sh", s.agent_loop_hours)
+    last_housekeeping = 0.0
 
     while True:
         paused = db.get_pref("agent_paused", False)
         if paused:
-            print("  ⏸ Agent paused. Sleeping 60s...")
+            logger.info("⏸ Agent paused. Sleeping 60s...")
             await asyncio.sleep(60)
             continue
 
-        print(f"\n{'='*50}")
-        print(f"  🔄 Agent Cycle — {__import__('datetime').datetime.now().strftime('%Y-%m-%d %H:%M')}")
-        print(f"{'='*50}")
+        logger.info("🔄 Agent Cycle — %s", datetime.now().strftime('%Y-%m-%d %H:%M'))
 
         t = time.time()
         scrape_result = await scraper.run_all()
-        print(f"  ✅ Scraped: {scrape_result['total']} jobs")
+        logger.info("✅ Scraped: %d jobs", scrape_result['total'])
 
-        match_result = await matcher.run()
-        print(f"  ✅ Matched: {match_result['matched']} jobs")
-
-        post = await post_gen.generate()
-        print(f"  ✅ Post generated: {post.get('post_type','')}")
+        # Matching and post generation only depend on DB state — overlap them
+        try:
+            match_result, post = await asyncio.gather(matcher.run(), post_gen.generate())
+            logger.info("✅ Matched: %d jobs", match_result['matched'])
+            logger.info("✅ Post generated: %s", post.get('post_type',''))
+        except UpstreamUnavailable as e:
+            logger.error("❌ AI provider unavailable, skipping this cycle: %s", e)
 
         stats = db.get_stats()
-        print(f"\n  📊 {stats['total_jobs']} jobs | {stats['total_matched']} matched | {stats['avg_score']:.0%} avg")
-        print(f"  ⏱  Cycle: {time.time()-t:.0f}s | 😴 Sleeping {s.agent_loop_hours}h...")
+        logger.info("📊 %d jobs | %d matched | %.0f%% avg",
+                    stats['total_jobs'], stats['total_matched'], stats['avg_score'] * 100)
+        if time.time() - last_housekeeping >= 86400:
+            # Daily: retire stale postings and move long-inactive ones to the archive
+            db.cleanup()
+            archived = db.archive_old_jobs()
+            if archived:
+                await matcher.forget_jobs(archived)
+            logger.info("🧹 Archived %d stale jobs", len(archived))
+            last_housekeeping = time.time()
+
+        logger.info("⏱  Cycle: %.0fs | 😴 Sleeping %sh...", time.time() - t, s.agent_loop_hours)
         await asyncio.sleep(interval)
 
 
@@ -94,14 +101,14 @@ async def run_mcp():
     await server.run_stdio()
 
 
-async def setup():
+def setup():
     """First-time setup wizard."""
     print("""
 ╔══════════════════════════════════════════════════════╗
 ║          ECHO — First Time Setup                     ║
 ╚══════════════════════════════════════════════════════╝
 """)
-    # Data directories
+    from pathlib import Path
     from config.settings import get_settings
     s = get_settings()
     
@@ -127,17 +134,30 @@ Or just run start.bat from the project root.
 """)
 
 
+def run_async(coro):
+    """
+    asyncio.run, on uvloop when it's installed (uvicorn[standard] pulls it in
+    on Linux/macOS). The API already gets uvloop from uvicorn's loop="auto".
+    """
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.run(coro)
+    with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+        return runner.run(coro)
+
+
 if __name__ == "__main__":
     mode = sys.argv[1] if len(sys.argv) > 1 else "api"
 
     if mode == "api":
         start_api()
     elif mode == "agent":
-        asyncio.run(run_agent())
+        run_async(run_agent())
     elif mode == "mcp":
-        asyncio.run(run_mcp())
+        run_async(run_mcp())
     elif mode == "setup":
-        asyncio.run(setup())
+        setup()
     else:
         print(f"Unknown mode: {mode}")
         print("Usage: python run.py [api|agent|mcp|setup]")
@@ -0,0 +1,65 @@
+"""
+src/agent/brain/embed_cache.py
+In-process LRU cache of embeddings keyed by a BLAKE2b hash of the text.
+Saved next to the vector store on exit so it survives restarts.
+"""
+import hashlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+import numpy as np
+from src.agent.brain.logger import get_logger
+
+logger = get_logger("embed_cache")
+
+
+class EmbeddingCache:
+    def __init__(self, path: Path, maxsize: int = 4096):
+        self.path = path
+        self.maxsize = maxsize
+        self._data: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._dirty = False
+        self._load()
+
+    @staticmethod
+    def key(text: str) -> str:
+        return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+    def get(self, text: str) -> Optional[np.ndarray]:
+        k = self.key(text)
+        vec = self._data.get(k)
+        if vec is not None:
+            self._data.move_to_end(k)
+        return vec
+
+    def put(self, text: str, vec) -> None:
+        k = self.key(text)
+        self._data[k] = np.asarray(vec, dtype=np.float32)
+        self._data.move_to_end(k)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+        self._dirty = True
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def _load(self):
+        if not self.path.exists():
+            return
+        try:
+            with np.load(str(self.path)) as data:
+                for k in data.files[-self.maxsize:]:
+                    self._data[k] = data[k]
+            logger.info(f"Loaded {len(self._data)} cached embeddings")
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable embedding cache: {e}")
+
+    def save(self):
+        if not self._dirty:
+            return
+        try:
+            with open(self.path, "wb") as f:
+                np.savez(f, **self._data)
+            self._dirty = False
+        except Exception as e:
+            logger.error(f"Embedding cache save failed: {e}")
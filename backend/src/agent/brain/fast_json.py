@@ -0,0 +1,87 @@
+"""
+src/agent/brain/fast_json.py
+JSON helpers backed by orjson when installed, stdlib json otherwise.
+"""
+import json
+import re
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+# Match stdlib json, which coerces int/float dict keys to strings
+_OPTS = orjson.OPT_NON_STR_KEYS if orjson is not None else 0
+
+
+def loads(data):
+    """Parse JSON from str or bytes."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps_bytes(obj) -> bytes:
+    """Serialize to compact UTF-8 JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=_OPTS)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def dumps(obj) -> str:
+    """Serialize to a compact JSON string."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=_OPTS).decode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+# LLM replies sometimes wrap JSON in fences/prose or leave trailing commas
+_FENCE = re.compile(r"^```(?:json)?\s*|\s*```$", re.I)
+_TRAILING_COMMA = re.compile(r",\s*([}\]])")
+
+
+def _json_blocks(text: str):
+    """Yield top-level balanced {...}/[...] spans in one string-aware pass."""
+    depth, start, in_str, esc = 0, -1, False, False
+    for i, ch in enumerate(text):
+        if in_str:
+            if esc:
+                esc = False
+            elif ch == "\\":
+                esc = True
+            elif ch == '"':
+                in_str = False
+        elif ch == '"':
+            in_str = depth > 0  # quotes in surrounding prose don't matter
+        elif ch in "{[":
+            if depth == 0:
+                start = i
+            depth += 1
+        elif ch in "}]" and depth:
+            depth -= 1
+            if depth == 0:
+                yield text[start:i + 1]
+
+
+def loads_lenient(text, default=None):
+    """
+    Parse JSON from an LLM reply: as-is, then without code fences, then the
+    largest embedded {...}/[...] block; each also retried with trailing
+    commas removed. Returns `default` if nothing parses.
+    """
+    if not text:
+        return default
+    if isinstance(text, (bytes, bytearray)):
+        text = text.decode("utf-8", "replace")
+    text = _FENCE.sub("", text.strip())
+    try:
+        return loads(text)
+    except ValueError:
+        pass
+    for candidate in (text, *sorted(_json_blocks(text), key=len, reverse=True)):
+        for attempt in (candidate, _TRAILING_COMMA.sub(r"\1", candidate)):
+            try:
+                return loads(attempt)
+            except ValueError:
+                pass
+    return default
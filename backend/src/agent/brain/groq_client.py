@@ -1,158 +1,370 @@
 import os
+import time
+import functools
+import atexit
 import asyncio
-from typing import List, Dict, Any, Generator
-from groq import Groq, AsyncGroq
+import httpx
+import numpy as np
+from collections import OrderedDict
+from typing import List, Dict, Any, Generator, Optional
+from groq import Groq, AsyncGroq, BadRequestError
 from config.settings import get_settings
+from src.agent.brain import fast_json
+from src.agent.brain.embed_cache import EmbeddingCache
+from src.agent.brain.logger import get_logger
+from src.agent.brain.ratelimit import (
+    AsyncRateLimiter, RetryableStatus, UpstreamUnavailable, RETRY_STATUSES, with_retry,
+)
 
-class GroqClient:
-    _instance = None
-    _embed_model = None
+logger = get_logger("groq_client")
+
+
+def _schema_unsupported(err: BadRequestError) -> bool:
+    """True when a 400 says the model doesn't support json_schema response_format."""
+    msg = str(err).lower()
+    if "json_validate_failed" in msg:
+        return False
+    return ("response_format" in msg or "json_schema" in msg) and "support" in msg
+
+_STREAM_FLUSH_SECS = 0.05
+# Static list since we successfully vetted them
+_STATIC_MODELS: List[Dict[str, Any]] = [
+    {"name": "llama-3.3-70b-versatile", "details": "Llama 3.3 70B (Recommended)"},
+    {"name": "llama-3.1-8b-instant", "details": "Llama 3.1 8B (Fast)"},
+    {"name": "mixtral-8x7b-32768", "details": "Mixtral 8x7B"},
+]
+_EMBED_BATCH_TOKENS = 8192  # summed-token budget per HF sub-batch
+
+
+def _est_tokens(text: str) -> int:
+    """Cheap token estimate (~4 chars per token) — good enough for packing."""
+    return len(text) // 4 + 1
 
-    def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super(GroqClient, cls).__new__(cls)
-            cls._instance._init_client()
-        return cls._instance
+class GroqClient:
+    """Groq chat + HF embeddings. Use get_groq_client() for the shared instance."""
 
-    def _init_client(self):
+    def __init__(self):
         s = get_settings()
         if not s.groq_api_key:
-            print("  ⚠️  WARNING: GROQ_API_KEY is missing! AI features will fail.")
+            logger.warning("GROQ_API_KEY is missing! AI features will fail.")
         
-        # Initialize Groq (Async)
-        self.client = AsyncGroq(api_key=s.groq_api_key)
+        # Initialize Groq (Async) on a pooled HTTP/2 client so bursts of chat
+        # calls reuse warm TLS connections; the semaphore caps in-flight calls.
+        limits = httpx.Limits(max_keepalive_connections=20, max_connections=50)
+        self.client = AsyncGroq(
+            api_key=s.groq_api_key,
+            http_client=httpx.AsyncClient(http2=True, limits=limits),
+            max_retries=0,  # retries are handled by _retry with backoff + jitter
+        )
+        self._sem = asyncio.Semaphore(s.groq_max_concurrency)
+        self._groq_rps = AsyncRateLimiter(s.groq_rps)
+        self._hf_rps = AsyncRateLimiter(s.hf_rps)
+        self._retries = s.api_max_retries
+        self._retry_base = s.api_retry_base_delay
+        self._retry_jitter = s.api_retry_jitter
+        self._available = bool(s.groq_api_key)
+        self._json_schema_ok = True  # flipped off if the model rejects json_schema output
         self.model = s.ai_model
+        self._temp = s.ai_temperature
+        self._max_tok = s.ai_max_tokens
+        self._flush_chars = s.stream_flush_chars
+        self._chat_cache: "OrderedDict[tuple, str]" = OrderedDict()
+        self._chat_cache_size = s.llm_cache_size if s.llm_cache_enabled else 0
         
         # Initialize Embeddings (HuggingFace Cloud API - 0 RAM usage on Render)
         self._hf_api_url = "https://api-inference.huggingface.co/pipeline/feature-extraction/sentence-transformers/all-MiniLM-L6-v2"
         # We don't need a token for public small-scale use, but user can add one later if needed
         self._hf_token = os.getenv("HF_TOKEN", "") 
-        print(f"  🧠 AI Client: Groq ({self.model}) + HuggingFace Cloud Embeddings")
+        self._http = None  # shared HF client, created on first use
+        self._embed_concurrency = s.embed_concurrency
+        self._embed_cache = EmbeddingCache(s.vs_path / "embed_cache.npz", s.embed_cache_size)
+        atexit.register(self._embed_cache.save)
+        logger.info("AI Client: Groq (%s) + HuggingFace Cloud Embeddings", self.model)
+
+    async def _client(self):
+        """Long-lived HTTP client for HF calls — keeps connections warm."""
+        if self._http is None or self._http.is_closed:
+            self._http = httpx.AsyncClient(
+                http2=True,
+                timeout=30,
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+            )
+        return self._http
+
+    def _retry(self, call, name: str):
+        return with_retry(call, name=name, retries=self._retries,
+                          base_delay=self._retry_base, jitter=self._retry_jitter)
+
+    async def _hf_post(self, payload: dict, headers: dict, timeout: int):
+        """POST to the HF endpoint under the rate limit; 429/5xx are retried."""
+        client = await self._client()
+
+        async def _call():
+            async with self._hf_rps:
+                response = await client.post(
+                    self._hf_api_url,
+                    content=fast_json.dumps_bytes(payload),
+                    headers=headers,
+                    timeout=timeout
+                )
+            if response.status_code in RETRY_STATUSES:
+                raise RetryableStatus(response.status_code, response.text[:200])
+            return response
+
+        return await self._retry(_call, "HF embeddings")
+
+    async def aclose(self):
+        """Close pooled HTTP connections (called on app shutdown)."""
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+        await self.client.close()
 
     async def chat(
         self, 
         messages: List[Dict[str, str]], 
         temperature: float = None,
-        json_mode: bool = False
+        json_mode: bool = False,
+        schema: Optional[Dict[str, Any]] = None,
+        schema_name: str = "response",
     ) -> str:
         """
         Get completion from Groq.
+        With `schema` (a JSON schema dict) the reply is constrained via
+        response_format=json_schema; models without structured-output
+        support fall back to JSON mode with the schema sent as a system hint.
+        Calls at the default temperature (or in JSON mode) are served from an
+        exact-match LRU cache; explicitly "creative" calls always hit the API.
+        Raises UpstreamUnavailable if Groq keeps rate-limiting after retries.
         """
         if not self.client:
             return "Error: Groq client not initialized."
 
+        json_mode = json_mode or schema is not None
+        temp = temperature if temperature is not None else self._temp
+        key = None
+        if self._chat_cache_size and (json_mode or temperature is None):
+            key = (self.model, temp, json_mode, schema_name if schema is not None else None,
+                   tuple((m["role"], m["content"]) for m in messages))
+            cached = self._chat_cache.get(key)
+            if cached is not None:
+                self._chat_cache.move_to_end(key)
+                return cached
+
         try:
             params = {
                 "model": self.model,
                 "messages": messages,
-                "temperature": temperature or get_settings().ai_temperature,
-                "max_tokens": get_settings().ai_max_tokens,
+                "temperature": temp,
+                "max_tokens": self._max_tok,
             }
-            if json_mode:
+            if schema is not None and self._json_schema_ok:
+                params["response_format"] = {
+                    "type": "json_schema",
+                    "json_schema": {"name": schema_name, "schema": schema},
+                }
+            elif json_mode:
                 params["response_format"] = {"type": "json_object"}
+                if schema is not None:
+                    hint = "Respond with JSON matching this schema: " + fast_json.dumps(schema)
+                    params["messages"] = [{"role": "system", "content": hint}, *messages]
+
+            async def _create():
+                async with self._groq_rps, self._sem:
+                    return await self.client.chat.completions.create(**params)
 
-            response = await self.client.chat.completions.create(**params)
-            return response.choices[0].message.content
+            try:
+                response = await self._retry(_create, "Groq chat")
+            except BadRequestError as e:
+                # Only a model that can't do json_schema turns it off; context
+                # overflows and one-off json_validate_failed replies re-raise
+                if schema is None or not self._json_schema_ok or not _schema_unsupported(e):
+                    raise
+                logger.warning("Model %s rejected json_schema output (%s); using JSON mode", self.model, e)
+                self._json_schema_ok = False
+                return await self.chat(messages, temperature, json_mode, schema, schema_name)
+            content = response.choices[0].message.content
+            if key is not None and content:
+                self._chat_cache[key] = content
+                if len(self._chat_cache) > self._chat_cache_size:
+                    self._chat_cache.popitem(last=False)
+            return content
+        except UpstreamUnavailable:
+            raise
         except Exception as e:
-            print(f"  ❌ Groq Chat Error: {e}")
+            logger.error("Groq Chat Error: %s", e)
             return ""
 
     async def embed(self, text: str) -> List[float]:
         """
         Generate embedding using HuggingFace Inference API (Cloud-based, 0 RAM).
+        Raises UpstreamUnavailable if HF keeps rate-limiting after retries.
         """
-        import httpx
+        cached = self._embed_cache.get(text)
+        if cached is not None:
+            return cached.tolist()
         try:
-            headers = {}
+            headers = {"Content-Type": "application/json"}
             if self._hf_token:
                 headers["Authorization"] = f"Bearer {self._hf_token}"
             
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    self._hf_api_url,
-                    json={"inputs": text, "options": {"wait_for_model": True}},
-                    headers=headers,
-                    timeout=20
-                )
-                if response.status_code == 200:
-                    return response.json()
-                else:
-                    print(f"  ⚠️ HF Embedding Error: {response.status_code} - {response.text}")
-                    return []
+            response = await self._hf_post(
+                {"inputs": text, "options": {"wait_for_model": True}}, headers, 20
+            )
+            if response.status_code == 200:
+                embedding = fast_json.loads(response.content)
+                if embedding:
+                    self._embed_cache.put(text, embedding)
+                return embedding
+            else:
+                logger.warning("HF Embedding Error: %s - %s", response.status_code, response.text)
+                return []
+        except UpstreamUnavailable:
+            raise
         except Exception as e:
-            print(f"  ❌ Cloud Embedding Error: {e}")
+            logger.error("Cloud Embedding Error: %s", e)
             return []
 
-    async def extract_json(self, prompt: str) -> Dict[str, Any]:
-        """Extract structured JSON from a prompt using Groq's JSON mode."""
-        import json
+    async def extract_json(self, prompt: str, schema: Optional[Dict[str, Any]] = None,
+                           schema_name: str = "response") -> Dict[str, Any]:
+        """Extract structured JSON from a prompt (JSON mode, or `schema` if given)."""
         try:
             msgs = [{"role": "user", "content": prompt}]
-            response_text = await self.chat(msgs, json_mode=True)
-            return json.loads(response_text)
+            response_text = await self.chat(msgs, json_mode=True, schema=schema, schema_name=schema_name)
+            return fast_json.loads_lenient(response_text, {})
+        except UpstreamUnavailable:
+            raise
         except Exception as e:
-            print(f"  ❌ JSON Extraction Error: {e}")
+            logger.error("JSON Extraction Error: %s", e)
             return {}
 
     async def stream_chat(self, messages: List[Dict[str, str]], system: str = None) -> Generator[str, None, None]:
-        """Stream chat response from Groq."""
-        s = get_settings()
+        """
+        Stream chat response from Groq.
+        Consumers should forward chunks as they arrive: never insert
+        asyncio.sleep(N > 0) between yields (that adds a per-chunk latency
+        floor); use asyncio.sleep(0) if an explicit yield point is needed.
+        """
         try:
             msgs = []
             if system:
                 msgs.append({"role": "system", "content": system})
             msgs.extend(messages)
 
-            stream = await self.client.chat.completions.create(
-                model=self.model,
-                messages=msgs,
-                temperature=s.ai_temperature,
-                max_tokens=s.ai_max_tokens,
-                stream=True
-            )
+            async def _create():
+                async with self._groq_rps, self._sem:
+                    return await self.client.chat.completions.create(
+                        model=self.model,
+                        messages=msgs,
+                        temperature=self._temp,
+                        max_tokens=self._max_tok,
+                        stream=True
+                    )
 
+            stream = await self._retry(_create, "Groq stream")
+
+            # Coalesce tokens into ~STREAM_FLUSH_CHARS pieces (or on newline /
+            # every 50ms) so consumers see far fewer, larger frames.
+            buf: List[str] = []
+            size = 0
+            last_flush = time.monotonic()
             async for chunk in stream:
-                 content = chunk.choices[0].delta.content
-                 if content:
-                     yield content
+                content = chunk.choices[0].delta.content
+                if not content:
+                    continue
+                buf.append(content)
+                size += len(content)
+                now = time.monotonic()
+                if (size >= self._flush_chars or content.endswith("\n")
+                        or now - last_flush >= _STREAM_FLUSH_SECS):
+                    yield "".join(buf)
+                    buf.clear()
+                    size = 0
+                    last_flush = now
+            if buf:
+                yield "".join(buf)
 
         except Exception as e:
-            print(f"  ❌ Groq Stream Error: {e}")
+            logger.error("Groq Stream Error: %s", e)
             yield f"[Error: {e}]"
 
     async def is_available(self) -> bool:
-        """Check if Groq is configured and reachable."""
-        return self.client.api_key is not None
+        """Check if Groq is configured (cached at init; async for interface compat)."""
+        return self._available
 
     async def list_models(self) -> List[Dict[str, Any]]:
-        """Return supported models."""
-        # Static list since we successfully vetted them
-        return [
-            {"name": "llama-3.3-70b-versatile", "details": "Llama 3.3 70B (Recommended)"},
-            {"name": "llama-3.1-8b-instant", "details": "Llama 3.1 8B (Fast)"},
-            {"name": "mixtral-8x7b-32768", "details": "Mixtral 8x7B"},
-        ]
-
-    async def embed_batch(self, texts: List[str]) -> List[List[float]]:
-        """Generate embeddings for a list of texts using HuggingFace Cloud API."""
-        import httpx
+        """Return supported models (shared module constant — do not mutate)."""
+        return _STATIC_MODELS
+
+    async def embed_batch(self, texts: List[str], batch_size: int = 64) -> np.ndarray:
+        """
+        Generate embeddings for a list of texts using HuggingFace Cloud API.
+        Texts are sorted longest-first and greedily packed into sub-batches
+        whose estimated token total stays under `_EMBED_BATCH_TOKENS` (and at
+        most `batch_size` texts), so each request pads to a similar length.
+        Texts already in the embedding cache are not re-sent.
+        Returns a contiguous float32 (len(texts), dim) array in input order —
+        empty on failure. Raises UpstreamUnavailable if HF keeps rate-limiting.
+        """
+        failed = np.empty((0, 0), dtype=np.float32)
+        if not texts:
+            return failed
+        cached = [self._embed_cache.get(t) for t in texts]
+        misses = [i for i, v in enumerate(cached) if v is None]
+        if not misses:
+            return np.stack(cached)
+        order = sorted(misses, key=lambda i: len(texts[i]), reverse=True)
         try:
-            headers = {}
+            headers = {"Content-Type": "application/json"}
             if self._hf_token:
                 headers["Authorization"] = f"Bearer {self._hf_token}"
-            
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    self._hf_api_url,
-                    json={"inputs": texts, "options": {"wait_for_model": True}},
-                    headers=headers,
-                    timeout=30
-                )
-                if response.status_code == 200:
-                    return response.json()
-                else:
-                    print(f"  ⚠️ HF Batch Embedding Error: {response.status_code} - {response.text}")
-                    return []
+
+            sem = asyncio.Semaphore(self._embed_concurrency)
+
+            async def _one(idxs: List[int]):
+                async with sem:
+                    response = await self._hf_post(
+                        {"inputs": [texts[i] for i in idxs], "options": {"wait_for_model": True}},
+                        headers, 30
+                    )
+                if response.status_code != 200:
+                    logger.warning("HF Batch Embedding Error: %s - %s", response.status_code, response.text)
+                    return None
+                return idxs, np.asarray(fast_json.loads(response.content), dtype=np.float32)
+
+            batches: List[List[int]] = []
+            cur: List[int] = []
+            cur_tok = 0
+            for i in order:
+                tok = _est_tokens(texts[i])
+                if cur and (cur_tok + tok > _EMBED_BATCH_TOKENS or len(cur) >= batch_size):
+                    batches.append(cur)
+                    cur, cur_tok = [], 0
+                cur.append(i)
+                cur_tok += tok
+            batches.append(cur)
+
+            # Sub-batches are independent requests — send them concurrently
+            parts = await asyncio.gather(*[_one(idxs) for idxs in batches])
+            if any(p is None for p in parts):
+                return failed
+            out = np.empty((len(texts), parts[0][1].shape[1]), dtype=np.float32)
+            for idxs, batch in parts:
+                out[idxs] = batch
+                for i, row in zip(idxs, batch):
+                    self._embed_cache.put(texts[i], row)
+            for i, vec in enumerate(cached):
+                if vec is not None:
+                    out[i] = vec
+            return out
+        except UpstreamUnavailable:
+            raise
         except Exception as e:
-            print(f"  ❌ Cloud Batch Embedding Error: {e}")
-            return []
+            logger.error("Cloud Batch Embedding Error: %s", e)
+            return failed
+
+
+@functools.lru_cache(maxsize=1)
+def get_groq_client() -> GroqClient:
+    """Process-wide GroqClient — built once, shares its HTTP pools."""
+    return GroqClient()
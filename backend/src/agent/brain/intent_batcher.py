@@ -0,0 +1,123 @@
+"""
+src/agent/brain/intent_batcher.py
+Micro-batcher for chat intent classification. Messages arriving within a
+short window share one Groq call, so the action list is prefilled once
+per batch instead of once per message.
+"""
+import asyncio
+from typing import List, Optional, Tuple
+from pydantic import ValidationError
+from src.agent.brain import fast_json
+from src.agent.brain.logger import get_logger
+from src.agent.brain.schemas import INTENT_BATCH_SCHEMA, INTENT_SCHEMA, Intent
+
+logger = get_logger("intent_batcher")
+
+_ACTIONS = """Actions:
+- show_jobs: user wants to see job matches
+- explain_job: user asks about a specific job (extract job_id if mentioned)
+- skill_gaps: user asks about missing skills or what to learn
+- generate_post: user wants a LinkedIn post
+- run_scrape: user wants to start job scraping now
+- upload_resume: user mentions resume
+- show_stats: user wants agent statistics
+- set_preference: user wants to change role/location/settings
+- weekly_posts: user wants all post types generated
+- chat: general question, career advice, other"""
+
+_SINGLE_PROMPT = """Classify this user message into one of these actions or 'chat':
+
+Message: "{message}"
+
+""" + _ACTIONS + """
+
+Return JSON with the action and any params."""
+
+_BATCH_PROMPT = """Classify each user message into one of these actions or 'chat'.
+
+""" + _ACTIONS + """
+
+Messages:
+{messages}
+
+Return JSON {{"intents": [...]}} with one action (and any params) per message, in the same order."""
+
+
+def _to_intent(result) -> Optional[Intent]:
+    if not isinstance(result, dict) or not result:
+        return None
+    try:
+        return Intent.model_validate(result)
+    except ValidationError:
+        return None
+
+
+class IntentBatcher:
+    """Coalesces concurrent `submit` calls into batched classification requests."""
+
+    def __init__(self, llm, max_batch: int = 8, window: float = 0.015):
+        self.llm = llm
+        self.max_batch = max_batch
+        self.window = window
+        self._queue: "asyncio.Queue[Tuple[str, asyncio.Future]]" = asyncio.Queue()
+        self._worker: Optional[asyncio.Task] = None
+        self._inflight: set = set()  # strong refs so dispatch tasks aren't GC'd
+
+    async def submit(self, message: str) -> Optional[Intent]:
+        """Classify one message; resolves once its batch comes back."""
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+        fut = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((message, fut))
+        return await fut
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.window
+            while len(batch) < self.max_batch:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            # Keep collecting the next batch while this one is in flight
+            task = asyncio.create_task(self._dispatch(batch))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+
+    async def _dispatch(self, batch: List[Tuple[str, asyncio.Future]]):
+        try:
+            intents = await self._classify([m for m, _ in batch])
+        except Exception as e:
+            for _, fut in batch:
+                if not fut.done():
+                    fut.set_exception(e)
+            return
+        for (_, fut), intent in zip(batch, intents):
+            if not fut.done():
+                fut.set_result(intent)
+
+    async def _classify_one(self, message: str) -> Optional[Intent]:
+        result = await self.llm.extract_json(_SINGLE_PROMPT.format(message=message),
+                                             schema=INTENT_SCHEMA, schema_name="intent")
+        return _to_intent(result)
+
+    async def _classify(self, messages: List[str]) -> List[Optional[Intent]]:
+        if len(messages) == 1:
+            return [await self._classify_one(messages[0])]
+
+        numbered = "\n".join(f"{i}. {fast_json.dumps(m)}" for i, m in enumerate(messages, 1))
+        result = await self.llm.extract_json(_BATCH_PROMPT.format(messages=numbered),
+                                             schema=INTENT_BATCH_SCHEMA, schema_name="intent_batch")
+        items = result.get("intents") if isinstance(result, dict) else None
+        if isinstance(items, list) and len(items) == len(messages):
+            return [_to_intent(item) for item in items]
+
+        # Misaligned reply — can't tell which intent is whose, classify one by one
+        logger.warning("Batched intent reply had %s items for %d messages, retrying singly",
+                       len(items) if isinstance(items, list) else "no", len(messages))
+        return list(await asyncio.gather(*(self._classify_one(m) for m in messages)))
@@ -1,8 +1,15 @@
 """
 src/agent/brain/logger.py — Structured color logging
+Records are queued and written by one background listener thread, so
+logging from coroutines never blocks on the console or the log file.
 """
+import atexit
 import logging
+import os
+import queue
 import sys
+import threading
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 from datetime import datetime
 
@@ -15,25 +22,55 @@ COLORS = {
     "CRITICAL": "\033[35m", "RESET": "\033[0m",
 }
 
+_NAME_COLOR = "\033[34m"
+_RESET = COLORS["RESET"]
+
 class ColorFormatter(logging.Formatter):
+    """Colors levelname/name for the console without touching the shared record."""
+
     def format(self, record):
         c = COLORS.get(record.levelname, "")
-        r = COLORS["RESET"]
-        record.levelname = f"{c}{record.levelname}{r}"
-        record.name = f"\033[34m{record.name}{r}"
-        return super().format(record)
+        line = (
+            f"{self.formatTime(record, self.datefmt)} | "
+            f"{_NAME_COLOR}{record.name}{_RESET} | "
+            f"{c}{record.levelname}{_RESET} | {record.getMessage()}"
+        )
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            line = f"{line}\n{record.exc_text}"
+        if record.stack_info:
+            line = f"{line}\n{self.formatStack(record.stack_info)}"
+        return line
+
+_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+_listener: QueueListener | None = None
+_listener_lock = threading.Lock()
+
+
+def _start_listener():
+    global _listener
+    with _listener_lock:
+        if _listener is not None:
+            return
+        # stderr, not stdout: the MCP server speaks JSON-RPC on stdout, and
+        # this handler writes from the listener thread
+        ch = logging.StreamHandler(sys.stderr)
+        ch.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
+        ch.setFormatter(ColorFormatter(datefmt="%H:%M:%S"))
+        fh = logging.FileHandler(LOG_DIR / f"echo_{datetime.now().strftime('%Y-%m-%d')}.log")
+        fh.setLevel(logging.DEBUG)
+        fh.setFormatter(logging.Formatter("%(asctime)s | %(name)s | %(levelname)s | %(message)s"))
+        _listener = QueueListener(_queue, ch, fh, respect_handler_level=True)
+        _listener.start()
+        atexit.register(_listener.stop)
+
 
 def get_logger(name: str) -> logging.Logger:
     logger = logging.getLogger(f"echo.{name}")
     if logger.handlers:
         return logger
     logger.setLevel(logging.DEBUG)
-    ch = logging.StreamHandler(sys.stdout)
-    ch.setLevel(logging.INFO)
-    ch.setFormatter(ColorFormatter("%(asctime)s | %(name)s | %(levelname)s | %(message)s", "%H:%M:%S"))
-    fh = logging.FileHandler(LOG_DIR / f"echo_{datetime.now().strftime('%Y-%m-%d')}.log")
-    fh.setLevel(logging.DEBUG)
-    fh.setFormatter(logging.Formatter("%(asctime)s | %(name)s | %(levelname)s | %(message)s"))
-    logger.addHandler(ch)
-    logger.addHandler(fh)
+    _start_listener()
+    logger.addHandler(QueueHandler(_queue))
     return logger
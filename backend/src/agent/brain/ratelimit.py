@@ -0,0 +1,89 @@
+"""
+src/agent/brain/ratelimit.py
+Async token-bucket limiter + retry-with-backoff for upstream AI APIs.
+Keeps bursts under the provider's RPS so we back off instead of hitting 429s.
+"""
+import time
+import random
+import asyncio
+from typing import Awaitable, Callable, TypeVar
+
+from src.agent.brain.logger import get_logger
+
+logger = get_logger("ratelimit")
+
+T = TypeVar("T")
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class UpstreamUnavailable(RuntimeError):
+    """Raised when an upstream API keeps failing after all retries."""
+
+
+class RetryableStatus(Exception):
+    """Internal marker: the upstream answered with a retryable HTTP status."""
+
+    def __init__(self, status_code: int, detail: str = ""):
+        super().__init__(f"HTTP {status_code} {detail}".strip())
+        self.status_code = status_code
+
+
+class AsyncRateLimiter:
+    """Token bucket: at most `rate` acquisitions per `period` seconds."""
+
+    def __init__(self, rate: float, period: float = 1.0):
+        self._capacity = max(1.0, float(rate))
+        self._fill_rate = self._capacity / period
+        self._tokens = self._capacity
+        self._last = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self._capacity, self._tokens + (now - self._last) * self._fill_rate)
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self._fill_rate)
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+def _status_of(exc: BaseException):
+    return getattr(exc, "status_code", None)
+
+
+async def with_retry(
+    call: Callable[[], Awaitable[T]],
+    *,
+    name: str,
+    retries: int,
+    base_delay: float,
+    jitter: float,
+) -> T:
+    """
+    Run `call()` retrying 429/5xx responses with exponential backoff + jitter.
+    Non-retryable errors propagate immediately; exhausted retries raise
+    UpstreamUnavailable.
+    """
+    for attempt in range(retries + 1):
+        try:
+            return await call()
+        except Exception as e:
+            status = _status_of(e)
+            if status not in RETRY_STATUSES:
+                raise
+            if attempt == retries:
+                raise UpstreamUnavailable(f"{name}: gave up after {retries + 1} attempts ({e})") from e
+            delay = base_delay * 2 ** attempt + random.uniform(0, jitter)
+            logger.warning("%s returned %s — retrying in %.2fs (%d/%d)", name, status, delay, attempt + 1, retries)
+            await asyncio.sleep(delay)
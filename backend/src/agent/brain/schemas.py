@@ -0,0 +1,76 @@
+"""
+src/agent/brain/schemas.py
+Pydantic schemas for structured LLM output. Sent to Groq as a JSON schema
+(response_format) instead of pasting JSON skeletons into every prompt.
+Fields are lenient on purpose: a slightly off value shouldn't drop a whole result.
+"""
+from typing import Any, Dict, List, Literal, Optional, Union
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class Education(BaseModel):
+    model_config = ConfigDict(extra="allow")
+    degree: str = ""
+    branch: str = ""
+    college: str = ""
+    graduation_year: Optional[Union[int, str]] = 2025
+    cgpa: Optional[Union[float, str]] = None
+
+
+class Project(BaseModel):
+    model_config = ConfigDict(extra="allow")
+    name: str = ""
+    description: str = ""
+    tech: List[str] = Field(default_factory=list)
+
+
+class ResumeProfile(BaseModel):
+    model_config = ConfigDict(extra="allow")
+    name: str = ""
+    email: str = ""
+    phone: str = ""
+    skills: List[str] = Field(default_factory=list)
+    tech_stack: List[str] = Field(default_factory=list)
+    experience_years: Union[float, str] = 0
+    education: Education = Field(default_factory=Education)
+    projects: List[Project] = Field(default_factory=list)
+    certifications: List[str] = Field(default_factory=list)
+    industry_tags: List[str] = Field(default_factory=list)
+    target_roles: List[str] = Field(default_factory=list)
+    strengths: List[str] = Field(default_factory=list)
+    summary: str = Field(default="", description="2 sentence professional summary")
+    experience_level: str = Field(default="fresher", description="fresher / junior / experienced")
+
+
+class SkillGap(BaseModel):
+    model_config = ConfigDict(extra="allow")
+    skill: str
+    priority: str = Field(default="medium", description="high / medium / low")
+    category: str = Field(default="general", description="e.g. ai, data, backend, cloud")
+    reason: str = ""
+
+
+class ResumeAnalysis(BaseModel):
+    profile: ResumeProfile = Field(default_factory=ResumeProfile)
+    gaps: List[SkillGap] = Field(default_factory=list)
+
+
+IntentAction = Literal[
+    "show_jobs", "explain_job", "skill_gaps", "generate_post", "run_scrape",
+    "upload_resume", "show_stats", "set_preference", "weekly_posts", "chat",
+]
+
+
+class Intent(BaseModel):
+    action: IntentAction = "chat"
+    params: Optional[Dict[str, Any]] = Field(default_factory=dict)
+
+
+class IntentBatch(BaseModel):
+    intents: List[Intent] = Field(default_factory=list, description="One per message, same order")
+
+
+# JSON schemas are built once at import and reused for every call
+RESUME_ANALYSIS_SCHEMA = ResumeAnalysis.model_json_schema()
+INTENT_SCHEMA = Intent.model_json_schema()
+INTENT_BATCH_SCHEMA = IntentBatch.model_json_schema()
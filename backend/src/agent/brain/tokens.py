@@ -0,0 +1,52 @@
+"""
+src/agent/brain/tokens.py
+Token-budget helpers for prompts. Uses tiktoken when installed; otherwise
+falls back to a ~4 chars/token estimate.
+"""
+from functools import lru_cache
+
+try:
+    import tiktoken
+except ImportError:  # pragma: no cover - optional, char estimate instead
+    tiktoken = None
+
+_CHARS_PER_TOKEN = 4
+
+
+@lru_cache(maxsize=1)
+def _encoder():
+    # cl100k is not Llama's tokenizer, but close enough to budget a prompt
+    return tiktoken.get_encoding("cl100k_base")
+
+
+def truncate_tokens(text: str, max_tokens: int) -> str:
+    """Cut `text` to at most `max_tokens` tokens (no-op when it already fits)."""
+    if not text:
+        return ""
+    if tiktoken is None:
+        return text[:max_tokens * _CHARS_PER_TOKEN]
+    # Every token is at least one char, so short text never needs encoding
+    if len(text) <= max_tokens:
+        return text
+    tokens = _encoder().encode(text)
+    if len(tokens) <= max_tokens:
+        return text
+    return _encoder().decode(tokens[:max_tokens])
+
+
+def truncate_list(items, max_tokens: int, sep: str = ", ") -> str:
+    """Join items until the next one would exceed the token budget."""
+    if tiktoken is None:
+        budget = max_tokens * _CHARS_PER_TOKEN
+        count = len
+    else:
+        budget = max_tokens
+        count = lambda s: len(_encoder().encode(s))
+    out, used = [], 0
+    for item in items:
+        cost = count(str(item)) + (1 if out else 0)
+        if used + cost > budget:
+            break
+        out.append(str(item))
+        used += cost
+    return sep.join(out)
@@ -4,11 +4,12 @@ Full SQLite schema + async-compatible DB manager.
 All paths from .env via settings.
 """
 import sqlite3
-import json
+import threading
 from pathlib import Path
-from datetime import datetime, timedelta
-from typing import Optional, List
+from datetime import datetime
+from typing import Optional, List, Iterator, Tuple
 from config.settings import get_settings
+from src.agent.brain import fast_json
 from src.agent.brain.logger import get_logger
 
 logger = get_logger("database")
@@ -35,6 +36,9 @@ CREATE TABLE IF NOT EXISTS jobs (
     is_active       BOOLEAN DEFAULT 1
 );
 
+-- Cold storage for long-inactive jobs (same columns, no constraints)
+CREATE TABLE IF NOT EXISTS jobs_archive AS SELECT * FROM jobs WHERE 0;
+
 -- ─── MATCHES ─────────────────────────────────────────────────
 CREATE TABLE IF NOT EXISTS job_matches (
     id              INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -50,6 +54,13 @@ CREATE TABLE IF NOT EXISTS job_matches (
     seen            BOOLEAN DEFAULT 0
 );
 
+-- Hash of the text each job was last embedded from (skip unchanged re-embeds)
+CREATE TABLE IF NOT EXISTS job_embeddings (
+    job_id          INTEGER PRIMARY KEY REFERENCES jobs(id) ON DELETE CASCADE,
+    text_hash       TEXT NOT NULL,
+    embedded_at     TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
 -- ─── RESUME ──────────────────────────────────────────────────
 CREATE TABLE IF NOT EXISTS resume_versions (
     id              INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -70,6 +81,14 @@ CREATE TABLE IF NOT EXISTS resume_versions (
     is_active       BOOLEAN DEFAULT 1
 );
 
+-- LLM analysis keyed by resume text hash (re-uploads skip the LLM call)
+CREATE TABLE IF NOT EXISTS resume_cache (
+    text_hash       TEXT PRIMARY KEY,
+    profile         TEXT NOT NULL,
+    gaps            TEXT DEFAULT '[]',
+    created_at      TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
 -- ─── SKILL GAPS ──────────────────────────────────────────────
 CREATE TABLE IF NOT EXISTS skill_gaps (
     id              INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -140,158 +159,320 @@ CREATE TABLE IF NOT EXISTS preferences (
 -- ─── INDICES ─────────────────────────────────────────────────
 CREATE INDEX IF NOT EXISTS idx_jobs_active      ON jobs(is_active, scraped_at DESC);
 CREATE INDEX IF NOT EXISTS idx_jobs_source      ON jobs(source);
+CREATE INDEX IF NOT EXISTS idx_jobs_filters     ON jobs(work_mode, company_type, is_active);
+CREATE INDEX IF NOT EXISTS idx_resume_active    ON resume_versions(is_active, version DESC);
 CREATE INDEX IF NOT EXISTS idx_matches_score    ON job_matches(final_score DESC);
-CREATE INDEX IF NOT EXISTS idx_matches_job      ON job_matches(job_id);
 CREATE INDEX IF NOT EXISTS idx_gaps_freq        ON skill_gaps(frequency DESC);
 CREATE INDEX IF NOT EXISTS idx_chat_session     ON chat_history(session_id, created_at);
 """
 
+# Keyword search: external-content FTS5 mirror of jobs, kept in sync by triggers.
+# The UPDATE trigger only fires for indexed columns, so upsert refreshes
+# (is_active / scraped_at) don't churn the index.
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(
+    title, company, description, skills_required,
+    content='jobs', content_rowid='id', tokenize='porter unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS jobs_fts_ai AFTER INSERT ON jobs BEGIN
+    INSERT INTO jobs_fts(rowid, title, company, description, skills_required)
+    VALUES (new.id, new.title, new.company, new.description, new.skills_required);
+END;
+CREATE TRIGGER IF NOT EXISTS jobs_fts_ad AFTER DELETE ON jobs BEGIN
+    INSERT INTO jobs_fts(jobs_fts, rowid, title, company, description, skills_required)
+    VALUES ('delete', old.id, old.title, old.company, old.description, old.skills_required);
+END;
+CREATE TRIGGER IF NOT EXISTS jobs_fts_au AFTER UPDATE OF title, company, description, skills_required ON jobs BEGIN
+    INSERT INTO jobs_fts(jobs_fts, rowid, title, company, description, skills_required)
+    VALUES ('delete', old.id, old.title, old.company, old.description, old.skills_required);
+    INSERT INTO jobs_fts(rowid, title, company, description, skills_required)
+    VALUES (new.id, new.title, new.company, new.description, new.skills_required);
+END;
+"""
+
+
+def _top_matches_sql(work_mode: bool, company_type: bool) -> str:
+    query = """
+            SELECT j.*, m.embed_score, m.llm_score, m.final_score,
+                   m.match_reasons, m.skill_overlap, m.skill_gaps, m.llm_reasoning
+            FROM job_matches m JOIN jobs j ON m.job_id=j.id
+            WHERE m.final_score>=? AND j.is_active=1
+        """
+    if work_mode:
+        query += " AND j.work_mode=?"
+    if company_type:
+        query += " AND j.company_type=?"
+    return query + " ORDER BY m.final_score DESC LIMIT ?"
+
+
+# Fixed SQL text per filter combination, so each stays hot in the statement cache
+_TOP_MATCHES_SQL = {(w, ct): _top_matches_sql(w, ct) for w in (False, True) for ct in (False, True)}
+
 
 class Database:
+    _resume_cache: dict = {}             # (db_path, resume id) -> parsed resume
+    _resume_lock = threading.Lock()
+
     def __init__(self):
         self.db_path = get_settings().db_path
+        self._local = threading.local()
         self._init()
         logger.info(f"DB ready: {self.db_path}")
 
     def _init(self):
         with self._conn() as c:
             c.executescript(SCHEMA)
+            self._migrate(c)
+
+    def _migrate(self, c: sqlite3.Connection):
+        # One match row per job: older DBs accumulated duplicates because
+        # INSERT OR REPLACE never conflicted without a UNIQUE(job_id).
+        if not c.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='index' AND name='idx_matches_job_unique'"
+        ).fetchone():
+            c.executescript("""
+                DELETE FROM job_matches
+                WHERE id NOT IN (SELECT MAX(id) FROM job_matches GROUP BY job_id);
+                CREATE UNIQUE INDEX idx_matches_job_unique ON job_matches(job_id);
+            """)
+        # The unique index covers job_id lookups; the old plain one is redundant
+        c.execute("DROP INDEX IF EXISTS idx_matches_job")
+        self._fts = True
+        if not c.execute("SELECT 1 FROM sqlite_master WHERE name='jobs_fts'").fetchone():
+            try:
+                c.executescript(FTS_SCHEMA)
+                c.execute("INSERT INTO jobs_fts(jobs_fts) VALUES ('rebuild')")
+            except sqlite3.OperationalError as e:
+                self._fts = False
+                logger.warning(f"FTS5 unavailable, keyword search falls back to LIKE: {e}")
 
     def _conn(self) -> sqlite3.Connection:
-        conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
-        conn.row_factory = sqlite3.Row
-        conn.execute("PRAGMA journal_mode=WAL")
-        conn.execute("PRAGMA foreign_keys=ON")
+        """
+        Per-thread persistent connection (opened + tuned once, then reused).
+        `with self._conn() as c:` still commits/rolls back — it never closes.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.db_path), check_same_thread=False,
+                                   cached_statements=256)
+            conn.row_factory = sqlite3.Row
+            conn.executescript("""
+                PRAGMA auto_vacuum=INCREMENTAL;
+                PRAGMA journal_mode=WAL;
+                PRAGMA synchronous=NORMAL;
+                PRAGMA cache_size=-65536;
+                PRAGMA mmap_size=268435456;
+                PRAGMA temp_store=MEMORY;
+                PRAGMA foreign_keys=ON;
+            """)
+            self._local.conn = conn
         return conn
 
+    def close(self):
+        """Close this thread's connection (others close when their thread exits)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
     def _j(self, val) -> str:
         """Serialize to JSON string."""
         if isinstance(val, str):
             return val
-        return json.dumps(val or [])
+        return fast_json.dumps(val or [])
 
     def _d(self, val, default=None):
         """Deserialize JSON string."""
         if not val:
             return default
         try:
-            return json.loads(val)
+            return fast_json.loads(val)
         except Exception:
             return default
 
+    def _job(self, row: sqlite3.Row) -> dict:
+        """Job row -> dict with skills_required decoded to a list, once, here."""
+        d = dict(row)
+        d["skills_required"] = self._d(d.get("skills_required"), [])
+        return d
+
     # ── JOBS ────────────────────────────────────────────────
 
     def upsert_job(self, job: dict) -> Optional[int]:
         try:
             with self._conn() as c:
-                ex = c.execute(
-                    "SELECT id FROM jobs WHERE external_id=?", (job.get("external_id"),)
-                ).fetchone()
-                if ex:
-                    c.execute(
-                        "UPDATE jobs SET is_active=1, scraped_at=CURRENT_TIMESTAMP WHERE id=?",
-                        (ex["id"],)
-                    )
-                    return ex["id"]
-                cur = c.execute("""
+                r = c.execute("""
                     INSERT INTO jobs (external_id,title,company,company_type,location,
                         work_mode,salary_min_lpa,salary_max_lpa,experience_min,
                         experience_max,description,skills_required,apply_url,source)
                     VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?)
-                """, (
-                    job.get("external_id"), job.get("title",""), job.get("company",""),
-                    job.get("company_type","unknown"), job.get("location",""),
-                    job.get("work_mode","onsite"), job.get("salary_min_lpa"),
-                    job.get("salary_max_lpa"), job.get("experience_min",0),
-                    job.get("experience_max",2), job.get("description",""),
-                    self._j(job.get("skills_required",[])), job.get("apply_url",""),
-                    job.get("source","")
-                ))
-                return cur.lastrowid
+                    ON CONFLICT(external_id) DO UPDATE SET
+                        is_active=1, scraped_at=CURRENT_TIMESTAMP
+                    RETURNING id
+                """, self._job_row(job)).fetchone()
+                return r["id"] if r else None
         except Exception as e:
             logger.error(f"upsert_job: {e}")
             return None
 
+    def _job_row(self, job: dict) -> tuple:
+        return (
+            job.get("external_id"), job.get("title",""), job.get("company",""),
+            job.get("company_type","unknown"), job.get("location",""),
+            job.get("work_mode","onsite"), job.get("salary_min_lpa"),
+            job.get("salary_max_lpa"), job.get("experience_min",0),
+            job.get("experience_max",2), job.get("description",""),
+            self._j(job.get("skills_required",[])), job.get("apply_url",""),
+            job.get("source","")
+        )
+
+    def upsert_jobs(self, jobs: List[dict]) -> int:
+        """Upsert a whole scrape batch in one transaction. Returns rows written."""
+        return self.upsert_job_rows([self._job_row(j) for j in jobs])
+
+    def upsert_job_rows(self, rows: List[tuple]) -> int:
+        """
+        Like upsert_jobs, but takes ready-made column tuples in _job_row
+        order (skills_required already JSON-encoded), e.g. ScrapedJob.row().
+        """
+        if not rows:
+            return 0
+        try:
+            with self._conn() as c:
+                c.executemany("""
+                    INSERT INTO jobs (external_id,title,company,company_type,location,
+                        work_mode,salary_min_lpa,salary_max_lpa,experience_min,
+                        experience_max,description,skills_required,apply_url,source)
+                    VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?)
+                    ON CONFLICT(external_id) DO UPDATE SET
+                        is_active=1, scraped_at=CURRENT_TIMESTAMP
+                """, rows)
+            return len(rows)
+        except Exception as e:
+            logger.error(f"upsert_jobs: {e}")
+            return 0
+
     def get_unmatched_jobs(self, limit: int = 200) -> List[dict]:
         with self._conn() as c:
             rows = c.execute("""
-                SELECT j.* FROM jobs j
-                LEFT JOIN job_matches m ON j.id=m.job_id
-                WHERE m.id IS NULL AND j.is_active=1
+                SELECT j.*, e.text_hash AS embed_hash FROM jobs j
+                LEFT JOIN job_embeddings e ON e.job_id=j.id
+                WHERE j.is_active=1
+                  AND NOT EXISTS (SELECT 1 FROM job_matches m WHERE m.job_id=j.id)
                 ORDER BY j.scraped_at DESC LIMIT ?
             """, (limit,)).fetchall()
-            return [dict(r) for r in rows]
+            return [self._job(r) for r in rows]
+
+    def set_embed_hashes(self, rows: List[Tuple[int, str]]):
+        """Record (job_id, text_hash) for jobs just written to the vector store."""
+        if not rows:
+            return
+        with self._conn() as c:
+            c.executemany("""
+                INSERT INTO job_embeddings (job_id,text_hash) VALUES (?,?)
+                ON CONFLICT(job_id) DO UPDATE SET
+                    text_hash=excluded.text_hash, embedded_at=CURRENT_TIMESTAMP
+            """, rows)
 
     def get_job_by_id(self, job_id: int) -> Optional[dict]:
         with self._conn() as c:
             r = c.execute("SELECT * FROM jobs WHERE id=?", (job_id,)).fetchone()
-            return dict(r) if r else None
+            return self._job(r) if r else None
 
-    def get_all_jobs(self) -> List[dict]:
+    def get_jobs_by_ids(self, job_ids: List[int]) -> List[dict]:
+        """Fetch many jobs in one query (order not guaranteed)."""
+        if not job_ids:
+            return []
+        marks = ",".join("?" * len(job_ids))
         with self._conn() as c:
-            rows = c.execute("SELECT * FROM jobs WHERE is_active=1").fetchall()
-            return [dict(r) for r in rows]
+            rows = c.execute(f"SELECT * FROM jobs WHERE id IN ({marks})", job_ids).fetchall()
+            return [self._job(r) for r in rows]
+
+    def iter_jobs(self, batch: int = 256) -> Iterator[dict]:
+        """Stream active jobs in fetchmany batches (O(batch) rows in memory)."""
+        cur = self._conn().execute("SELECT * FROM jobs WHERE is_active=1")
+        for rows in iter(lambda: cur.fetchmany(batch), []):
+            for r in rows:
+                yield self._job(r)
+
+    def get_all_jobs(self) -> List[dict]:
+        return list(self.iter_jobs())
 
     def get_top_matches(self, limit: int = 20, min_score: float = 0.50,
                          work_mode: str = None, company_type: str = None) -> List[dict]:
-        query = """
-            SELECT j.*, m.embed_score, m.llm_score, m.final_score,
-                   m.match_reasons, m.skill_overlap, m.skill_gaps, m.llm_reasoning
-            FROM job_matches m JOIN jobs j ON m.job_id=j.id
-            WHERE m.final_score>=? AND j.is_active=1
-        """
+        query = _TOP_MATCHES_SQL[bool(work_mode), bool(company_type)]
         params = [min_score]
         if work_mode:
-            query += " AND j.work_mode=?"
             params.append(work_mode)
         if company_type:
-            query += " AND j.company_type=?"
             params.append(company_type)
-        query += " ORDER BY m.final_score DESC LIMIT ?"
         params.append(limit)
 
-        with self._conn() as c:
-            rows = c.execute(query, params).fetchall()
         results = []
-        for r in rows:
+        for r in self._conn().execute(query, params):
             d = dict(r)
-            for k in ["match_reasons","skill_overlap","skill_gaps","skills_required"]:
+            for k in ("match_reasons","skill_overlap","skill_gaps","skills_required"):
                 d[k] = self._d(d.get(k), [])
             results.append(d)
         return results
 
+    _SAVE_MATCH_SQL = """
+        INSERT INTO job_matches
+        (job_id,embed_score,llm_score,final_score,match_reasons,
+         skill_overlap,skill_gaps,llm_reasoning)
+        VALUES (?,?,?,?,?,?,?,?)
+        ON CONFLICT(job_id) DO UPDATE SET
+            embed_score=excluded.embed_score, llm_score=excluded.llm_score,
+            final_score=excluded.final_score, match_reasons=excluded.match_reasons,
+            skill_overlap=excluded.skill_overlap, skill_gaps=excluded.skill_gaps,
+            llm_reasoning=excluded.llm_reasoning, matched_at=CURRENT_TIMESTAMP
+    """
+
+    def _match_row(self, match: dict) -> tuple:
+        return (
+            match["job_id"], match.get("embed_score",0),
+            match.get("llm_score"), match.get("final_score",0),
+            self._j(match.get("match_reasons",[])),
+            self._j(match.get("skill_overlap",[])),
+            self._j(match.get("skill_gaps",[])),
+            match.get("llm_reasoning",""),
+        )
+
     def save_match(self, match: dict) -> Optional[int]:
         try:
             with self._conn() as c:
-                cur = c.execute("""
-                    INSERT OR REPLACE INTO job_matches
-                    (job_id,embed_score,llm_score,final_score,match_reasons,
-                     skill_overlap,skill_gaps,llm_reasoning)
-                    VALUES (?,?,?,?,?,?,?,?)
-                """, (
-                    match["job_id"], match.get("embed_score",0),
-                    match.get("llm_score"), match.get("final_score",0),
-                    self._j(match.get("match_reasons",[])),
-                    self._j(match.get("skill_overlap",[])),
-                    self._j(match.get("skill_gaps",[])),
-                    match.get("llm_reasoning",""),
-                ))
-                return cur.lastrowid
+                r = c.execute(self._SAVE_MATCH_SQL + " RETURNING id", self._match_row(match)).fetchone()
+                return r["id"]
         except Exception as e:
             logger.error(f"save_match: {e}")
             return None
 
+    def save_matches(self, matches: List[dict]) -> int:
+        """Save a whole matcher pass in one transaction. Returns rows written."""
+        if not matches:
+            return 0
+        try:
+            with self._conn() as c:
+                c.executemany(self._SAVE_MATCH_SQL, [self._match_row(m) for m in matches])
+            return len(matches)
+        except Exception as e:
+            logger.error(f"save_matches: {e}")
+            return 0
+
     # ── RESUME ──────────────────────────────────────────────
 
     def save_resume(self, data: dict) -> int:
+        with Database._resume_lock:
+            Database._resume_cache = {}
         with self._conn() as c:
             c.execute("UPDATE resume_versions SET is_active=0")
             v = (c.execute("SELECT MAX(version) as v FROM resume_versions").fetchone()["v"] or 0) + 1
-            cur = c.execute("""
+            r = c.execute("""
                 INSERT INTO resume_versions (version,filename,raw_text,skills,tech_stack,
                     experience_years,education,industry_tags,projects,certifications,
                     summary,target_roles,strengths)
                 VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?)
+                RETURNING id
             """, (
                 v, data.get("filename","resume"),
                 data.get("raw_text",""), self._j(data.get("skills",[])),
@@ -300,38 +481,98 @@ class Database:
                 self._j(data.get("projects",[])), self._j(data.get("certifications",[])),
                 data.get("summary",""), self._j(data.get("target_roles",[])),
                 self._j(data.get("strengths",[])),
-            ))
-            return cur.lastrowid
+            )).fetchone()
+            return r["id"]
 
-    def get_active_resume(self) -> Optional[dict]:
+    def get_cached_analysis(self, text_hash: str) -> Optional[dict]:
+        """Cached {profile, gaps} for a resume text hash, or None."""
         with self._conn() as c:
             r = c.execute(
-                "SELECT * FROM resume_versions WHERE is_active=1 ORDER BY version DESC LIMIT 1"
+                "SELECT profile, gaps FROM resume_cache WHERE text_hash=?", (text_hash,)
             ).fetchone()
-            if not r:
-                return None
-            d = dict(r)
-            for k in ["skills","tech_stack","industry_tags","projects",
-                       "certifications","target_roles","strengths"]:
-                d[k] = self._d(d.get(k), [])
-            d["education"] = self._d(d.get("education"), {})
-            return d
+        if not r:
+            return None
+        return {"profile": self._d(r["profile"], {}), "gaps": self._d(r["gaps"], [])}
+
+    def save_cached_analysis(self, text_hash: str, profile: dict, gaps: list):
+        with self._conn() as c:
+            c.execute(
+                "INSERT OR REPLACE INTO resume_cache (text_hash,profile,gaps) VALUES (?,?,?)",
+                (text_hash, fast_json.dumps(profile), self._j(gaps))
+            )
+
+    def get_active_resume(self) -> Optional[dict]:
+        """
+        Active resume, parsed. The parsed dict is cached (shared by all
+        Database instances) and revalidated with an index-only id lookup,
+        so uploads from another process are still picked up. Treat the
+        result as read-only.
+        """
+        c = self._conn()
+        head = c.execute(
+            "SELECT id FROM resume_versions WHERE is_active=1 ORDER BY version DESC LIMIT 1"
+        ).fetchone()
+        if not head:
+            return None
+        key = (str(self.db_path), head["id"])
+        with Database._resume_lock:
+            cached = Database._resume_cache.get(key)
+        if cached is not None:
+            return cached
+
+        r = c.execute("SELECT * FROM resume_versions WHERE id=?", (head["id"],)).fetchone()
+        if not r:
+            return None
+        d = dict(r)
+        for k in ["skills","tech_stack","industry_tags","projects",
+                   "certifications","target_roles","strengths"]:
+            d[k] = self._d(d.get(k), [])
+        d["education"] = self._d(d.get("education"), {})
+        with Database._resume_lock:
+            Database._resume_cache = {key: d}
+        return d
+
+    def search_jobs(self, query: str, limit: int = 20) -> List[dict]:
+        """BM25-ranked keyword search over active jobs (title/company/description/skills)."""
+        terms = query.split()
+        if not terms:
+            return []
+        with self._conn() as c:
+            if self._fts:
+                # Quote every term so user input can't inject FTS5 query syntax
+                match = " ".join('"' + t.replace('"', '""') + '"' for t in terms)
+                rows = c.execute("""
+                    SELECT j.* FROM jobs_fts f JOIN jobs j ON j.id=f.rowid
+                    WHERE jobs_fts MATCH ? AND j.is_active=1
+                    ORDER BY bm25(jobs_fts) LIMIT ?
+                """, (match, limit)).fetchall()
+            else:
+                like = f"%{query}%"
+                rows = c.execute("""
+                    SELECT * FROM jobs WHERE is_active=1
+                      AND (title LIKE ? OR description LIKE ? OR skills_required LIKE ?)
+                    ORDER BY scraped_at DESC LIMIT ?
+                """, (like, like, like, limit)).fetchall()
+        return [self._job(r) for r in rows]
 
     # ── SKILL GAPS ──────────────────────────────────────────
 
+    _BUMP_SKILL_SQL = """
+        INSERT INTO skill_gaps (skill_name,our_level,category) VALUES (?,?,?)
+        ON CONFLICT(skill_name) DO UPDATE SET
+            frequency=frequency+1, last_seen=CURRENT_TIMESTAMP
+    """
+
     def bump_skill(self, skill: str, level: str = "none", category: str = "general"):
         with self._conn() as c:
-            ex = c.execute("SELECT id FROM skill_gaps WHERE skill_name=?", (skill,)).fetchone()
-            if ex:
-                c.execute(
-                    "UPDATE skill_gaps SET frequency=frequency+1, last_seen=CURRENT_TIMESTAMP WHERE id=?",
-                    (ex["id"],)
-                )
-            else:
-                c.execute(
-                    "INSERT INTO skill_gaps (skill_name,our_level,category) VALUES (?,?,?)",
-                    (skill, level, category)
-                )
+            c.execute(self._BUMP_SKILL_SQL, (skill, level, category))
+
+    def bump_skills_many(self, rows: List[Tuple[str, str, str]]):
+        """Bump many (skill, level, category) rows in one transaction."""
+        if not rows:
+            return
+        with self._conn() as c:
+            c.executemany(self._BUMP_SKILL_SQL, rows)
 
     def get_skill_gaps(self, limit: int = 15) -> List[dict]:
         with self._conn() as c:
@@ -347,7 +588,7 @@ class Database:
         with self._conn() as c:
             c.execute(
                 "INSERT OR REPLACE INTO preferences (key,value,updated_at) VALUES (?,?,CURRENT_TIMESTAMP)",
-                (key, json.dumps(value))
+                (key, fast_json.dumps(value))
             )
 
     def get_pref(self, key: str, default=None):
@@ -363,10 +604,14 @@ class Database:
     # ── CHAT HISTORY ────────────────────────────────────────
 
     def save_message(self, session_id: str, role: str, content: str, tool_call: str = ""):
+        self.save_messages([(session_id, role, content, tool_call)])
+
+    def save_messages(self, rows: List[Tuple[str, str, str, str]]):
+        """Insert (session_id, role, content, tool_call) rows in one transaction."""
         with self._conn() as c:
-            c.execute(
+            c.executemany(
                 "INSERT INTO chat_history (session_id,role,content,tool_call) VALUES (?,?,?,?)",
-                (session_id, role, content, tool_call)
+                rows
             )
 
     def get_history(self, session_id: str, limit: int = 20) -> List[dict]:
@@ -381,17 +626,18 @@ class Database:
 
     def save_post(self, post: dict) -> int:
         with self._conn() as c:
-            cur = c.execute("""
+            r = c.execute("""
                 INSERT INTO linkedin_posts (post_type,target_role,topic,content,
                     hook,hashtags,engagement_pred)
                 VALUES (?,?,?,?,?,?,?)
+                RETURNING id
             """, (
                 post.get("post_type",""), post.get("target_role",""),
                 post.get("topic",""), post.get("content",""),
                 post.get("hook",""), self._j(post.get("hashtags",[])),
                 post.get("engagement","medium"),
-            ))
-            return cur.lastrowid
+            )).fetchone()
+            return r["id"]
 
     def get_recent_posts(self, limit: int = 5) -> List[dict]:
         with self._conn() as c:
@@ -413,7 +659,7 @@ class Database:
             c.execute("""
                 INSERT INTO agent_decisions (action,reasoning,status,duration_secs,output,error_msg)
                 VALUES (?,?,?,?,?,?)
-            """, (action, reasoning, status, duration, json.dumps(output or {}), error))
+            """, (action, reasoning, status, duration, fast_json.dumps(output or {}), error))
 
     # ── REPORTS ─────────────────────────────────────────────
 
@@ -435,20 +681,54 @@ class Database:
 
     def get_stats(self) -> dict:
         with self._conn() as c:
+            total_jobs, total_matched, avg_score, total_posts = c.execute("""
+                SELECT (SELECT COUNT(*) FROM jobs WHERE is_active=1),
+                       (SELECT COUNT(*) FROM job_matches),
+                       (SELECT COALESCE(AVG(final_score), 0) FROM job_matches),
+                       (SELECT COUNT(*) FROM linkedin_posts)
+            """).fetchone()
+            prefs = dict(c.execute(
+                "SELECT key, value FROM preferences WHERE key IN ('agent_paused','last_scrape_time')"
+            ).fetchall())
             return {
-                "total_jobs":    c.execute("SELECT COUNT(*) FROM jobs WHERE is_active=1").fetchone()[0],
-                "total_matched": c.execute("SELECT COUNT(*) FROM job_matches").fetchone()[0],
-                "avg_score":     c.execute("SELECT AVG(final_score) FROM job_matches").fetchone()[0] or 0,
-                "total_posts":   c.execute("SELECT COUNT(*) FROM linkedin_posts").fetchone()[0],
+                "total_jobs":    total_jobs,
+                "total_matched": total_matched,
+                "avg_score":     avg_score,
+                "total_posts":   total_posts,
                 "top_gaps":      [r[0] for r in c.execute(
                     "SELECT skill_name FROM skill_gaps ORDER BY frequency DESC LIMIT 5"
                 ).fetchall()],
-                "agent_paused":  self.get_pref("agent_paused", False),
-                "last_scrape":   self.get_pref("last_scrape_time", None),
+                "agent_paused":  self._d(prefs.get("agent_paused"), False),
+                "last_scrape":   self._d(prefs.get("last_scrape_time"), None),
             }
 
     def cleanup(self, days: int = 30):
-        from datetime import timedelta
-        cutoff = (datetime.now() - timedelta(days=days)).isoformat()
+        """Deactivate jobs not seen for `days` (compared in SQLite, UTC like CURRENT_TIMESTAMP)."""
+        with self._conn() as c:
+            c.execute(
+                "UPDATE jobs SET is_active=0 WHERE is_active=1 AND scraped_at < datetime('now', ?)",
+                (f"-{days} days",)
+            )
+        self._conn().execute("PRAGMA optimize")
+
+    def archive_old_jobs(self, days: int = 60) -> List[int]:
+        """
+        Move inactive jobs older than `days` into jobs_archive and delete
+        them (matches cascade) in one transaction, keeping the hot tables
+        and their indexes small. Returns the moved ids for
+        VectorStore.forget_jobs.
+        """
+        cutoff = (f"-{days} days",)
         with self._conn() as c:
-            c.execute("UPDATE jobs SET is_active=0 WHERE scraped_at<?", (cutoff,))
+            c.execute("""
+                INSERT INTO jobs_archive SELECT * FROM jobs
+                WHERE is_active=0 AND scraped_at < datetime('now', ?)
+            """, cutoff)
+            rows = c.execute(
+                "DELETE FROM jobs WHERE is_active=0 AND scraped_at < datetime('now', ?) RETURNING id",
+                cutoff
+            ).fetchall()
+        if rows:
+            # Only reclaims pages on DBs created with auto_vacuum=INCREMENTAL
+            self._conn().execute("PRAGMA incremental_vacuum")
+        return [r["id"] for r in rows]
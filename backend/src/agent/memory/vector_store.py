@@ -3,13 +3,14 @@ src/agent/memory/vector_store.py
 FAISS vector store using Ollama's nomic-embed-text (free, local).
 No sentence-transformers dependency — pure Ollama embeddings.
 """
-import json
+import os
 import pickle
-import asyncio
+import platform
 import numpy as np
 from pathlib import Path
-from typing import Optional, List
+from typing import Optional, List, Union
 from config.settings import get_settings
+from src.agent.brain import fast_json
 from src.agent.brain.logger import get_logger
 
 logger = get_logger("vector_store")
@@ -20,75 +21,226 @@ class VectorStore:
         s = get_settings()
         self.store_dir = s.vs_path
         self.dim = s.embedding_dim
+        self.hnsw_threshold = s.hnsw_threshold
+        self.flat_fp16 = s.faiss_flat_fp16
+        self.hnsw_m = s.hnsw_m
+        self.hnsw_ef_construction = s.hnsw_ef_construction
+        self.hnsw_ef_search = s.hnsw_ef_search
+        self.index_spec = s.faiss_index_spec
+        self.ivf_nprobe = s.ivf_nprobe
         self.index = None
         self.id_map: dict[int, int] = {}      # faiss_idx -> job_id
         self.meta: dict[int, dict] = {}
         self.next_idx = 0
+        self._dirty = False
         self._init()
 
     def _init(self):
+        # Idle OpenMP workers should sleep rather than spin between searches
+        os.environ.setdefault("OMP_WAIT_POLICY", "PASSIVE")
         try:
             import faiss
             self._faiss = faiss
         except ImportError:
             raise ImportError("Install faiss: pip install faiss-cpu")
+        cores = self._physical_cores()
+        if cores:  # unknown → keep FAISS's default rather than guess
+            faiss.omp_set_num_threads(cores)
+        self._check_simd()
 
         idx_path = self.store_dir / "jobs.index"
-        meta_path = self.store_dir / "meta.pkl"
+        data = self._load_meta()
 
-        if idx_path.exists() and meta_path.exists():
+        if idx_path.exists() and data is not None:
             logger.info("Loading existing FAISS index...")
             self.index = self._faiss.read_index(str(idx_path))
-            with open(meta_path, "rb") as f:
-                data = pickle.load(f)
-                self.id_map = data.get("id_map", {})
-                self.meta = data.get("meta", {})
-                self.next_idx = data.get("next_idx", 0)
+            self.id_map = data["id_map"]
+            self.meta = data["meta"]
+            self.next_idx = data["next_idx"]
             logger.info(f"Loaded {self.next_idx} vectors")
+            if self._is_promoted():
+                self._tune_search()
+            else:
+                self._maybe_promote()
+        else:
+            self.index = self._new_exact_index()
+            logger.info(f"Creating new FAISS index ({type(self.index).__name__}, inner product = cosine sim)")
+
+    def _check_simd(self):
+        """Warn when an x86 host loaded a generic (non-AVX2) FAISS build."""
+        if platform.machine().lower() not in ("x86_64", "amd64"):
+            return
+        opts = self._faiss.get_compile_options() if hasattr(self._faiss, "get_compile_options") else ""
+        if "AVX2" not in opts and "AVX512" not in opts:
+            logger.warning(f"FAISS loaded without AVX2 kernels ({opts or 'generic'}) — "
+                           "inner-product scans will be slower; unset FAISS_NO_AVX2 / reinstall faiss-cpu")
+
+    @staticmethod
+    def _physical_cores() -> Optional[int]:
+        """
+        Physical core count — SMT siblings share FMA units and slow exact
+        search. None when it can't be determined (halving os.cpu_count()
+        would pin 1–2 vCPU hosts, which aren't SMT pairs, to one thread).
+        """
+        try:
+            import psutil
+        except ImportError:
+            return None
+        return psutil.cpu_count(logical=False) or None
+
+    def _new_exact_index(self):
+        """
+        Brute-force index for small collections. fp16 storage halves the
+        bytes the inner-product scan streams, with negligible recall loss.
+        """
+        if self.flat_fp16:
+            return self._faiss.IndexScalarQuantizer(
+                self.dim, self._faiss.ScalarQuantizer.QT_fp16, self._faiss.METRIC_INNER_PRODUCT
+            )
+        return self._faiss.IndexFlatIP(self.dim)
+
+    def _is_promoted(self) -> bool:
+        faiss = self._faiss
+        if isinstance(self.index, faiss.IndexFlat):
+            return False
+        return not (isinstance(self.index, faiss.IndexScalarQuantizer)
+                    and self.index.sq.qtype == faiss.ScalarQuantizer.QT_fp16)
+
+    def _tune_search(self):
+        """Apply search-time knobs (efSearch / nprobe) to an ANN index."""
+        if hasattr(self.index, "hnsw"):
+            self.index.hnsw.efSearch = self.hnsw_ef_search
+        try:
+            self._faiss.extract_index_ivf(self.index).nprobe = self.ivf_nprobe
+        except (RuntimeError, ValueError):
+            pass  # not an IVF index
+
+    def _build_ann(self, n: int):
+        if not self.index_spec:
+            return self._faiss.IndexHNSWFlat(self.dim, self.hnsw_m, self._faiss.METRIC_INNER_PRODUCT)
+        spec = self.index_spec.format(nlist=max(1, int(np.sqrt(n))), m=self.hnsw_m)
+        return self._faiss.index_factory(self.dim, spec, self._faiss.METRIC_INNER_PRODUCT)
+
+    def _maybe_promote(self):
+        """
+        Exact search is fastest for small collections. Once the index grows
+        past `hnsw_threshold`, rebuild it as an ANN index (HNSW by default, or
+        FAISS_INDEX_SPEC) with inner product, so scores stay cosine similarity.
+        """
+        if self._is_promoted() or self.index.ntotal < self.hnsw_threshold:
+            return
+        n = self.index.ntotal
+        vecs = np.ascontiguousarray(self.index.reconstruct_n(0, n), dtype=np.float32)
+        ann = self._build_ann(n)
+        if hasattr(ann, "hnsw"):
+            ann.hnsw.efConstruction = self.hnsw_ef_construction
+        if not ann.is_trained:
+            ann.train(vecs)
+        ann.add(vecs)
+        self.index = ann
+        self._tune_search()
+        logger.info(f"Promoted FAISS index to {type(ann).__name__} ({n} vectors)")
+
+    def _load_meta(self) -> Optional[dict]:
+        """Read meta.json; migrate a legacy meta.pkl (our own file) once."""
+        json_path = self.store_dir / "meta.json"
+        if json_path.exists():
+            data = fast_json.loads(json_path.read_bytes())
+        elif (self.store_dir / "meta.pkl").exists():
+            logger.info("Migrating vector meta from meta.pkl to meta.json")
+            with open(self.store_dir / "meta.pkl", "rb") as f:
+                data = pickle.load(f)
         else:
-            logger.info("Creating new FAISS index (IndexFlatIP for cosine sim)")
-            self.index = self._faiss.IndexFlatIP(self.dim)
+            return None
+        # JSON object keys are strings — restore the integer FAISS ids
+        return {
+            "id_map": {int(k): v for k, v in data.get("id_map", {}).items()},
+            "meta": {int(k): v for k, v in data.get("meta", {}).items()},
+            "next_idx": data.get("next_idx", 0),
+        }
 
     def _save(self):
         self._faiss.write_index(self.index, str(self.store_dir / "jobs.index"))
-        with open(self.store_dir / "meta.pkl", "wb") as f:
-            pickle.dump({
-                "id_map": self.id_map, "meta": self.meta, "next_idx": self.next_idx
-            }, f)
-
-    def _normalize(self, vec: np.ndarray) -> np.ndarray:
-        norm = np.linalg.norm(vec)
-        if norm == 0:
-            return vec
-        return vec / norm
-
-    def add_job_vector(self, job_id: int, embedding: List[float], metadata: dict = None) -> int:
-        """Add one job embedding to the index."""
-        vec = np.array(embedding, dtype=np.float32)
-        if len(vec) != self.dim:
-            logger.warning(f"Embedding dim mismatch: got {len(vec)}, expected {self.dim}")
-            # Pad or truncate
-            if len(vec) < self.dim:
-                vec = np.pad(vec, (0, self.dim - len(vec)))
-            else:
-                vec = vec[:self.dim]
-        vec = self._normalize(vec).reshape(1, -1)
-        self.index.add(vec)
+        tmp = self.store_dir / "meta.json.tmp"
+        tmp.write_bytes(fast_json.dumps_bytes({
+            "id_map": self.id_map, "meta": self.meta, "next_idx": self.next_idx
+        }))
+        tmp.replace(self.store_dir / "meta.json")
+
+    def add_job_vector(self, job_id: int, embedding: Union[List[float], np.ndarray, bytes],
+                       metadata: dict = None) -> int:
+        """
+        Add one job embedding to the index. Accepts a list, a float32 ndarray
+        row, or raw float32 bytes; each is copied exactly once into an array
+        we own (so normalizing in place never touches the caller's buffer).
+        """
+        if isinstance(embedding, (bytes, bytearray, memoryview)):
+            vec = np.frombuffer(embedding, dtype=np.float32).copy()
+        elif isinstance(embedding, np.ndarray):
+            vec = np.array(embedding, dtype=np.float32)
+        else:
+            vec = np.asarray(embedding, dtype=np.float32)
         idx = self.next_idx
-        self.id_map[idx] = job_id
-        self.meta[idx] = metadata or {}
-        self.next_idx += 1
-        if self.next_idx % 50 == 0:
-            self._save()
+        self._add_owned(self._fit_dim(vec.reshape(1, -1)), [job_id], [metadata or {}])
         return idx
 
+    def add_job_vectors(self, job_ids: List[int], embeddings: np.ndarray,
+                        metas: List[dict] = None) -> int:
+        """
+        Bulk-add job embeddings in one pass: a single contiguous float32
+        (n, dim) matrix, normalized in place, then one index.add call.
+        """
+        vecs = np.ascontiguousarray(embeddings, dtype=np.float32)
+        if vecs.ndim != 2 or len(vecs) == 0:
+            return 0
+        fitted = self._fit_dim(vecs)
+        if fitted is vecs and isinstance(embeddings, np.ndarray) and np.shares_memory(vecs, embeddings):
+            fitted = vecs.copy()  # never normalize the caller's array in place
+        return self._add_owned(fitted, job_ids, metas)
+
+    def _fit_dim(self, vecs: np.ndarray) -> np.ndarray:
+        """Pad or truncate (n, d) rows to the index dim (new array only if needed)."""
+        if vecs.shape[1] == self.dim:
+            return vecs
+        logger.warning(f"Embedding dim mismatch: got {vecs.shape[1]}, expected {self.dim}")
+        if vecs.shape[1] < self.dim:
+            return np.pad(vecs, ((0, 0), (0, self.dim - vecs.shape[1])))
+        return np.ascontiguousarray(vecs[:, :self.dim])
+
+    def _add_owned(self, vecs: np.ndarray, job_ids: List[int], metas: List[dict] = None) -> int:
+        self._faiss.normalize_L2(vecs)
+        self.index.add(vecs)
+        metas = metas or [{}] * len(vecs)
+        idxs = range(self.next_idx, self.next_idx + len(vecs))
+        self.id_map.update(zip(idxs, job_ids))
+        self.meta.update((i, m or {}) for i, m in zip(idxs, metas))
+        self.next_idx += len(vecs)
+        self._dirty = True
+        self._maybe_promote()
+        return len(vecs)
+
+    def forget_jobs(self, job_ids: List[int]) -> int:
+        """
+        Drop deleted jobs from the id map so searches stop returning them.
+        The vectors stay in the index (HNSW can't remove) until a rebuild.
+        """
+        gone = set(job_ids)
+        stale = [i for i, j in self.id_map.items() if j in gone]
+        for i in stale:
+            del self.id_map[i]
+            self.meta.pop(i, None)
+        if stale:
+            self._dirty = True
+        return len(stale)
+
     def save_resume_vector(self, embedding: List[float]):
         """Save resume embedding separately."""
         vec = np.array(embedding, dtype=np.float32)
         if len(vec) != self.dim:
             vec = vec[:self.dim] if len(vec) > self.dim else np.pad(vec, (0, self.dim - len(vec)))
-        vec = self._normalize(vec)
-        np.save(str(self.store_dir / "resume.npy"), vec)
+        vec = np.ascontiguousarray(vec).reshape(1, -1)
+        self._faiss.normalize_L2(vec)  # in place, single SIMD pass
+        np.save(str(self.store_dir / "resume.npy"), vec[0])
         logger.info("Resume vector saved ✓")
 
     def get_resume_vector(self) -> Optional[np.ndarray]:
@@ -103,27 +255,35 @@ class VectorStore:
         if self.index.ntotal == 0:
             return []
 
-        k = min(top_k, self.index.ntotal)
-        scores, indices = self.index.search(resume_vec.reshape(1, -1), k)
+        # Forgotten jobs keep their vectors in the index; over-fetch by that
+        # many so orphans don't eat into the top_k live results
+        orphans = self.index.ntotal - len(self.id_map)
+        k = min(top_k + orphans, self.index.ntotal)
+        query = np.ascontiguousarray(resume_vec.reshape(1, -1), dtype=np.float32)
+        scores, indices = self.index.search(query, k)
 
-        results = []
-        for score, idx in zip(scores[0], indices[0]):
-            if idx < 0:
-                continue
-            results.append({
-                "job_id": self.id_map.get(idx),
-                "score": float(score),
-                "meta": self.meta.get(idx, {}),
-            })
-        return sorted(results, key=lambda x: x["score"], reverse=True)
+        # FAISS already returns hits best-first; convert once to Python scalars
+        return [
+            {"job_id": self.id_map.get(idx), "score": score, "meta": self.meta.get(idx, {})}
+            for idx, score in zip(indices[0].tolist(), scores[0].tolist())
+            if idx in self.id_map
+        ][:top_k]
 
     def get_stats(self) -> dict:
         return {
             "total_vectors": self.index.ntotal if self.index else 0,
             "has_resume": (self.store_dir / "resume.npy").exists(),
             "dim": self.dim,
+            "index_type": type(self.index).__name__ if self.index else None,
         }
 
     def flush(self):
+        """
+        Persist index + meta once per ingest batch (no periodic checkpoints:
+        a lost tail is simply re-embedded from the DB on the next run).
+        """
+        if not self._dirty:
+            return
         self._save()
+        self._dirty = False
         logger.info("Vector store flushed")
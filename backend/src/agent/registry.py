@@ -0,0 +1,36 @@
+"""
+src/agent/registry.py
+Process-wide singletons for the agent's heavyweight services.
+Each accessor builds its object once; later calls return the same instance.
+"""
+from functools import lru_cache
+
+
+@lru_cache(maxsize=1)
+def get_db():
+    from src.agent.memory.database import Database
+    return Database()
+
+
+@lru_cache(maxsize=1)
+def get_scraper():
+    from src.agent.scrapers.job_scraper import ScraperOrchestrator
+    return ScraperOrchestrator()
+
+
+@lru_cache(maxsize=1)
+def get_matcher():
+    from src.agent.tools.job_matcher import JobMatcher
+    return JobMatcher()
+
+
+@lru_cache(maxsize=1)
+def get_analyzer():
+    from src.agent.tools.resume_analyzer import ResumeAnalyzer
+    return ResumeAnalyzer()
+
+
+@lru_cache(maxsize=1)
+def get_post_gen():
+    from src.agent.tools.linkedin_generator import LinkedInGenerator
+    return LinkedInGenerator()
@@ -5,18 +5,138 @@ Sources: Naukri, Indeed India, Internshala, Wellfound, Cutshort
 All config (delays, retries, roles, locations) from .env + DB preferences.
 """
 import hashlib
+import functools
 import random
 import re
 import asyncio
-from typing import Optional
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
 import httpx
-from bs4 import BeautifulSoup
+import soupsieve as sv
+from bs4 import BeautifulSoup, SoupStrainer
 from config.settings import get_settings
+from src.agent.brain import fast_json
 from src.agent.brain.logger import get_logger
 from src.agent.memory.database import Database
 
 logger = get_logger("scraper")
 
+_WS = re.compile(r'\s+')
+_SAL_RANGE = re.compile(r'(\d+\.?\d*)\s*(?:to|-|–)\s*(\d+\.?\d*)\s*(?:lpa|l|lakh)', re.I)
+_SAL_SINGLE = re.compile(r'(\d+\.?\d*)\s*(?:lpa|l|lakh)', re.I)
+_DIGIT = re.compile(r'\d')
+_REMOTE = re.compile(r'remote', re.I)
+_HYBRID = re.compile(r'hybrid', re.I)
+_DEFAULT_MNCS = (
+    "tcs", "infosys", "wipro", "accenture", "capgemini", "ibm", "hcl",
+    "cognizant", "tech mahindra", "ltimindtree", "deloitte", "ey", "kpmg",
+)
+
+
+@functools.lru_cache(maxsize=8)
+def _mnc_matcher(names: Tuple[str, ...]):
+    """One compiled alternation over all MNC names: a single scan per company."""
+    if not names:
+        return lambda _: None
+    return re.compile("|".join(map(re.escape, names))).search
+
+
+def _clean_text(text: str) -> str:
+    return _WS.sub(' ', text or "").strip()[:4000]
+
+
+def build_card_parser(card: str, limit: int, fields: Dict[str, str], link: str,
+                      strainer: Optional[SoupStrainer] = None,
+                      required: Tuple[str, ...] = ("title",)) -> Callable[[bytes], List[dict]]:
+    """
+    Compile a source's CSS selectors once and return `parse(html)`, which
+    yields one dict per card: the cleaned text of every field plus "href"
+    (None when the card has no link). Cards whose `required` entries are
+    empty are skipped. `strainer` limits tree building to the card subtrees.
+    """
+    card_sel = sv.compile(card)
+    field_sels = [(name, sv.compile(sel)) for name, sel in fields.items()]
+    link_sel = sv.compile(link)
+
+    def parse(html: bytes) -> List[dict]:
+        soup = BeautifulSoup(html, "lxml", parse_only=strainer)
+        rows = []
+        for el in card_sel.select(soup, limit):
+            row = {}
+            for name, sel in field_sels:
+                hit = sel.select_one(el)
+                row[name] = _clean_text(hit.get_text()) if hit else ""
+            hit = link_sel.select_one(el)
+            row["href"] = hit.get("href", "") if hit else None
+            if all(row[k] for k in required):
+                rows.append(row)
+        return rows
+
+    return parse
+
+
+# Per-source card layouts. Strainers only build the job-card subtrees (the
+# rest of each page is skipped); Wellfound's cards match on a data-test
+# attribute OR a class, which one strainer can't express.
+_NAUKRI_PARSER = build_card_parser(
+    ".jobTuple, article.jobTuple, .cust-job-tuple", 12,
+    {"title": ".title, .jobTitle, h2 a", "company": ".company-name, .comp-name",
+     "location": ".location, .loc, .locWdth", "salary": ".salary"},
+    link="a[href*='/job-listings']",
+    strainer=SoupStrainer(class_=["jobTuple", "cust-job-tuple"]),
+    required=("title", "href"),
+)
+_INDEED_PARSER = build_card_parser(
+    ".job_seen_beacon, .tapItem", 10,
+    {"title": "h2 span, .jobTitle span", "company": ".companyName",
+     "location": ".companyLocation"},
+    link="a[data-jk], a[href*='/rc/clk']",
+    strainer=SoupStrainer(class_=["job_seen_beacon", "tapItem"]),
+    required=("title", "href"),
+)
+_INTERNSHALA_PARSER = build_card_parser(
+    ".internship_meta, .individual_internship", 10,
+    {"title": ".profile, .job-title, h3", "company": ".company-name, .company_name"},
+    link="a[href*='/job/detail'], a[href*='/jobs/detail']",
+    strainer=SoupStrainer(class_=["internship_meta", "individual_internship"]),
+)
+_WELLFOUND_PARSER = build_card_parser(
+    "[data-test='JobListing'], .styles_jobListingCard__", 10,
+    {"title": "h2, h3, [data-test='JobTitle']",
+     "company": "[data-test='company-name'], .styles_company__"},
+    link="a[href*='/jobs']",
+)
+
+
+@dataclass(slots=True)
+class ScrapedJob:
+    """One parsed job card. Slotted: a scrape yields hundreds of these."""
+    external_id: str
+    title: str
+    company: str
+    company_type: str = "unknown"
+    location: str = ""
+    work_mode: str = "onsite"
+    salary_min_lpa: Optional[float] = None
+    salary_max_lpa: Optional[float] = None
+    experience_min: int = 0
+    experience_max: int = 2
+    description: str = ""
+    skills_required: List[str] = field(default_factory=list)
+    apply_url: str = ""
+    source: str = ""
+
+    def row(self) -> tuple:
+        """Column tuple for Database.upsert_job_rows (jobs INSERT order)."""
+        return (
+            self.external_id, self.title, self.company, self.company_type,
+            self.location, self.work_mode, self.salary_min_lpa, self.salary_max_lpa,
+            self.experience_min, self.experience_max, self.description,
+            fast_json.dumps(self.skills_required), self.apply_url, self.source,
+        )
+
+
 USER_AGENTS = [
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
     "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
@@ -34,6 +154,8 @@ class BaseScraper:
         self.delay = s.scrape_delay_seconds
         self.max_retries = s.scrape_max_retries
         self.random_delay = s.scrape_random_delay
+        self._sem = asyncio.Semaphore(s.scrape_concurrency)
+        self._client: Optional[httpx.AsyncClient] = None  # created on first request
         # Get roles/locations from DB preferences (user can change via chat)
         self.roles = self.db.get_pref("target_roles", [
             "AI Engineer", "Python Developer", "Data Analyst",
@@ -43,77 +165,113 @@ class BaseScraper:
             "Bangalore", "Hyderabad", "Pune", "Chennai", "Gurgaon", "India"
         ])
         self.exp_max = self.db.get_pref("max_experience_years", 2)
-
-    async def _get(self, url: str, params: dict = None) -> Optional[str]:
-        headers = {
-            "User-Agent": random.choice(USER_AGENTS),
-            "Accept": "text/html,application/xhtml+xml,*/*;q=0.8",
-            "Accept-Language": "en-IN,en;q=0.9",
-            "Connection": "keep-alive",
-        }
+        # Read once per scrape rather than once per parsed card
+        self._is_mnc = _mnc_matcher(tuple(self.db.get_pref("known_mncs", list(_DEFAULT_MNCS))))
+
+    def _http(self) -> httpx.AsyncClient:
+        """One pooled client per scraper so requests reuse TCP/TLS connections."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                headers={
+                    "Accept": "text/html,application/xhtml+xml,*/*;q=0.8",
+                    "Accept-Language": "en-IN,en;q=0.9",
+                },
+                timeout=15,
+                follow_redirects=True,
+                http2=True,
+                limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+            )
+        return self._client
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _get(self, url: str, params: dict = None) -> Optional[bytes]:
+        """
+        Fetch a page as raw bytes: lxml parses bytes natively, so we skip
+        decoding the whole body into a Python str first.
+        """
+        client = self._http()
         for attempt in range(self.max_retries):
             sleep_time = self.delay + (random.uniform(0, 2) if self.random_delay else 0)
             await asyncio.sleep(sleep_time)
             try:
-                async with httpx.AsyncClient(
-                    headers=headers, timeout=15, follow_redirects=True
-                ) as client:
-                    resp = await client.get(url, params=params)
-                    if resp.status_code == 200:
-                        return resp.text
-                    elif resp.status_code == 429:
-                        logger.warning(f"Rate limited on {self.source}. Sleeping 30s...")
-                        await asyncio.sleep(30)
-                    elif resp.status_code in [403, 404]:
-                        return None
+                resp = await client.get(
+                    url, params=params, headers={"User-Agent": random.choice(USER_AGENTS)}
+                )
+                if resp.status_code == 200:
+                    return resp.content
+                elif resp.status_code == 429:
+                    logger.warning(f"Rate limited on {self.source}. Sleeping 30s...")
+                    await asyncio.sleep(30)
+                elif resp.status_code in [403, 404]:
+                    return None
             except Exception as e:
                 logger.debug(f"{self.source} request failed (attempt {attempt+1}): {e}")
         return None
 
+    async def _get_many(self, reqs: List[Tuple[str, Optional[dict]]]) -> List[Optional[bytes]]:
+        """Fetch (url, params) pairs concurrently, at most `scrape_concurrency` at a time."""
+        async def one(url, params):
+            async with self._sem:
+                return await self._get(url, params)
+        return await asyncio.gather(*(one(url, params) for url, params in reqs))
+
+    async def _parse_pages(self, pages: List[Optional[bytes]], *per_page: list) -> list:
+        """
+        Run `_parse` over fetched pages in a worker thread so tree building
+        doesn't block the event loop (other scrapers keep downloading).
+        Extra lists supply per-page positional args, e.g. Naukri's role.
+        """
+        def work():
+            jobs = []
+            for html, *args in zip(pages, *per_page):
+                if html:
+                    jobs.extend(self._parse(html, *args))
+            return jobs
+        return await asyncio.to_thread(work)
+
     def _make_id(self, *parts) -> str:
         raw = f"{self.source}:" + ":".join(str(p) for p in parts)
         return hashlib.md5(raw.encode()).hexdigest()[:20]
 
-    def _clean(self, text: str) -> str:
-        return re.sub(r'\s+', ' ', text or "").strip()[:4000]
-
     def _salary_lpa(self, text: str) -> tuple:
         if not text or "not" in text.lower():
             return None, None
-        m = re.search(r'(\d+\.?\d*)\s*(?:to|-|–)\s*(\d+\.?\d*)\s*(?:lpa|l|lakh)', text, re.I)
+        if not _DIGIT.search(text):  # "Competitive", "As per industry" ...
+            return None, None
+        m = _SAL_RANGE.search(text)
         if m:
             return float(m.group(1)), float(m.group(2))
-        m = re.search(r'(\d+\.?\d*)\s*(?:lpa|l|lakh)', text, re.I)
+        m = _SAL_SINGLE.search(text)
         if m:
             v = float(m.group(1))
             return v, v
         return None, None
 
     def _work_mode(self, text: str) -> str:
-        t = (text or "").lower()
-        if "remote" in t:
+        # Case-insensitive search — no lowercased copy of the text per card
+        if not text:
+            return "onsite"
+        if _REMOTE.search(text):
             return "remote"
-        if "hybrid" in t:
+        if _HYBRID.search(text):
             return "hybrid"
         return "onsite"
 
     def _company_type(self, company: str) -> str:
-        # Use LLM preference stored in DB, not hardcoded list
-        known_mncs = self.db.get_pref("known_mncs", [
-            "tcs", "infosys", "wipro", "accenture", "capgemini", "ibm", "hcl",
-            "cognizant", "tech mahindra", "ltimindtree", "deloitte", "ey", "kpmg"
-        ])
-        c = company.lower()
-        if any(m in c for m in known_mncs):
+        # Use LLM preference stored in DB (loaded in __init__), not hardcoded list
+        if self._is_mnc(company.lower()):
             return "mnc"
         return "startup"
 
     async def scrape(self) -> list:
         raise NotImplementedError
 
-    def save(self, jobs: list) -> int:
-        saved = sum(1 for j in jobs if self.db.upsert_job(j))
-        return saved
+    def save(self, jobs: List[ScrapedJob]) -> int:
+        return self.db.upsert_job_rows([j.row() for j in jobs])
 
 
 class NaukriScraper(BaseScraper):
@@ -121,51 +279,34 @@ class NaukriScraper(BaseScraper):
     BASE = "https://www.naukri.com"
 
     async def scrape(self) -> list:
-        jobs = []
-        for role in self.roles[:4]:
-            for loc in self.locations[:3]:
-                role_slug = role.lower().replace(" ", "-")
-                loc_slug = loc.lower().replace(" ", "-")
-                html = await self._get(f"{self.BASE}/{role_slug}-jobs-in-{loc_slug}")
-                if html:
-                    jobs.extend(self._parse(html, role))
+        pairs = [(role, loc) for role in self.roles[:4] for loc in self.locations[:3]]
+        pages = await self._get_many([
+            (f"{self.BASE}/{role.lower().replace(' ', '-')}-jobs-in-{loc.lower().replace(' ', '-')}", None)
+            for role, loc in pairs
+        ])
+        jobs = await self._parse_pages(pages, [role for role, _ in pairs])
         logger.info(f"Naukri: {len(jobs)} jobs")
         return jobs
 
-    def _parse(self, html: str, role: str) -> list:
-        soup = BeautifulSoup(html, "html.parser")
+    def _parse(self, html: bytes, role: str) -> list:
         results = []
-        for card in soup.select(".jobTuple, article.jobTuple, .cust-job-tuple")[:12]:
-            try:
-                title_el = card.select_one(".title, .jobTitle, h2 a")
-                title = self._clean(title_el.get_text() if title_el else "")
-                company_el = card.select_one(".company-name, .comp-name")
-                company = self._clean(company_el.get_text() if company_el else "")
-                location_el = card.select_one(".location, .loc, .locWdth")
-                location = self._clean(location_el.get_text() if location_el else "")
-                link_el = card.select_one("a[href*='/job-listings']")
-                if not title or not link_el:
-                    continue
-                link = link_el.get("href","")
-                if link.startswith("/"):
-                    link = self.BASE + link
-                salary_el = card.select_one(".salary")
-                salary = self._clean(salary_el.get_text() if salary_el else "")
-                sal_min, sal_max = self._salary_lpa(salary)
-
-                results.append({
-                    "external_id": self._make_id(company, title, link),
-                    "title": title, "company": company,
-                    "company_type": self._company_type(company),
-                    "location": location,
-                    "work_mode": self._work_mode(location + title),
-                    "salary_min_lpa": sal_min, "salary_max_lpa": sal_max,
-                    "experience_min": 0, "experience_max": self.exp_max,
-                    "description": "", "skills_required": [],
-                    "apply_url": link, "source": self.source,
-                })
-            except Exception:
-                continue
+        for f in _NAUKRI_PARSER(html):
+            title, company, location = f["title"], f["company"], f["location"]
+            link = f["href"]
+            if link.startswith("/"):
+                link = self.BASE + link
+            sal_min, sal_max = self._salary_lpa(f["salary"])
+            results.append(ScrapedJob(
+                external_id=self._make_id(company, title, link),
+                title=title, company=company,
+                company_type=self._company_type(company),
+                location=location,
+                work_mode=self._work_mode(location + title),
+                salary_min_lpa=sal_min, salary_max_lpa=sal_max,
+                experience_min=0, experience_max=self.exp_max,
+                description="", skills_required=[],
+                apply_url=link, source=self.source,
+            ))
         return results
 
 
@@ -174,48 +315,37 @@ class IndeedScraper(BaseScraper):
     BASE = "https://in.indeed.com"
 
     async def scrape(self) -> list:
-        jobs = []
-        for role in self.roles[:3]:
-            html = await self._get(f"{self.BASE}/jobs", params={
+        pages = await self._get_many([
+            (f"{self.BASE}/jobs", {
                 "q": f"{role} fresher 0-2 years",
                 "l": "India",
                 "fromage": "7",
                 "sort": "date",
             })
-            if html:
-                jobs.extend(self._parse(html))
+            for role in self.roles[:3]
+        ])
+        jobs = await self._parse_pages(pages)
         logger.info(f"Indeed India: {len(jobs)} jobs")
         return jobs
 
-    def _parse(self, html: str) -> list:
-        soup = BeautifulSoup(html, "html.parser")
+    def _parse(self, html: bytes) -> list:
         results = []
-        for card in soup.select(".job_seen_beacon, .tapItem")[:10]:
-            try:
-                title_el = card.select_one("h2 span, .jobTitle span")
-                company_el = card.select_one(".companyName")
-                location_el = card.select_one(".companyLocation")
-                link_el = card.select_one("a[data-jk], a[href*='/rc/clk']")
-                if not title_el or not link_el:
-                    continue
-                title = self._clean(title_el.get_text())
-                company = self._clean(company_el.get_text() if company_el else "")
-                location = self._clean(location_el.get_text() if location_el else "India")
-                href = link_el.get("href","")
-                link = self.BASE + href if href.startswith("/") else href
-                results.append({
-                    "external_id": self._make_id(company, title, link),
-                    "title": title, "company": company,
-                    "company_type": self._company_type(company),
-                    "location": location,
-                    "work_mode": self._work_mode(location + title),
-                    "salary_min_lpa": None, "salary_max_lpa": None,
-                    "experience_min": 0, "experience_max": self.exp_max,
-                    "description": "", "skills_required": [],
-                    "apply_url": link, "source": self.source,
-                })
-            except Exception:
-                continue
+        for f in _INDEED_PARSER(html):
+            title, company = f["title"], f["company"]
+            location = f["location"] or "India"
+            href = f["href"]
+            link = self.BASE + href if href.startswith("/") else href
+            results.append(ScrapedJob(
+                external_id=self._make_id(company, title, link),
+                title=title, company=company,
+                company_type=self._company_type(company),
+                location=location,
+                work_mode=self._work_mode(location + title),
+                salary_min_lpa=None, salary_max_lpa=None,
+                experience_min=0, experience_max=self.exp_max,
+                description="", skills_required=[],
+                apply_url=link, source=self.source,
+            ))
         return results
 
 
@@ -224,42 +354,29 @@ class InternshalaJobsScraper(BaseScraper):
     BASE = "https://internshala.com"
 
     async def scrape(self) -> list:
-        jobs = []
         cats = ["computer-science-jobs", "data-science-jobs", "machine-learning-jobs"]
-        for cat in cats[:2]:
-            html = await self._get(f"{self.BASE}/jobs/{cat}")
-            if html:
-                jobs.extend(self._parse(html))
+        pages = await self._get_many([(f"{self.BASE}/jobs/{cat}", None) for cat in cats[:2]])
+        jobs = await self._parse_pages(pages)
         logger.info(f"Internshala: {len(jobs)} jobs")
         return jobs
 
-    def _parse(self, html: str) -> list:
-        soup = BeautifulSoup(html, "html.parser")
+    def _parse(self, html: bytes) -> list:
         results = []
-        for card in soup.select(".internship_meta, .individual_internship")[:10]:
-            try:
-                title_el = card.select_one(".profile, .job-title, h3")
-                company_el = card.select_one(".company-name, .company_name")
-                link_el = card.select_one("a[href*='/job/detail'], a[href*='/jobs/detail']")
-                if not title_el:
-                    continue
-                title = self._clean(title_el.get_text())
-                company = self._clean(company_el.get_text() if company_el else "")
-                href = link_el.get("href","") if link_el else ""
-                link = self.BASE + href if href.startswith("/") else href
-                results.append({
-                    "external_id": self._make_id(company, title, link),
-                    "title": title, "company": company,
-                    "company_type": "startup",
-                    "location": "India", "work_mode": "hybrid",
-                    "salary_min_lpa": None, "salary_max_lpa": None,
-                    "experience_min": 0, "experience_max": 1,
-                    "description": "", "skills_required": [],
-                    "apply_url": link or f"{self.BASE}/jobs",
-                    "source": self.source,
-                })
-            except Exception:
-                continue
+        for f in _INTERNSHALA_PARSER(html):
+            title, company = f["title"], f["company"]
+            href = f["href"] or ""
+            link = self.BASE + href if href.startswith("/") else href
+            results.append(ScrapedJob(
+                external_id=self._make_id(company, title, link),
+                title=title, company=company,
+                company_type="startup",
+                location="India", work_mode="hybrid",
+                salary_min_lpa=None, salary_max_lpa=None,
+                experience_min=0, experience_max=1,
+                description="", skills_required=[],
+                apply_url=link or f"{self.BASE}/jobs",
+                source=self.source,
+            ))
         return results
 
 
@@ -268,46 +385,33 @@ class WellfoundScraper(BaseScraper):
     BASE = "https://wellfound.com"
 
     async def scrape(self) -> list:
-        jobs = []
         paths = [
             "/role/r/software-engineer?job_listing_type=full_time&country=IN",
             "/role/r/data-scientist?job_listing_type=full_time&country=IN",
             "/role/r/machine-learning-engineer?job_listing_type=full_time&country=IN",
         ]
-        for path in paths[:2]:
-            html = await self._get(self.BASE + path)
-            if html:
-                jobs.extend(self._parse(html))
+        pages = await self._get_many([(self.BASE + path, None) for path in paths[:2]])
+        jobs = await self._parse_pages(pages)
         logger.info(f"Wellfound: {len(jobs)} jobs")
         return jobs
 
-    def _parse(self, html: str) -> list:
-        soup = BeautifulSoup(html, "html.parser")
+    def _parse(self, html: bytes) -> list:
         results = []
-        for card in soup.select("[data-test='JobListing'], .styles_jobListingCard__")[:10]:
-            try:
-                title_el = card.select_one("h2, h3, [data-test='JobTitle']")
-                company_el = card.select_one("[data-test='company-name'], .styles_company__")
-                link_el = card.select_one("a[href*='/jobs']")
-                if not title_el:
-                    continue
-                title = self._clean(title_el.get_text())
-                company = self._clean(company_el.get_text() if company_el else "")
-                href = link_el.get("href","") if link_el else ""
-                link = self.BASE + href if href.startswith("/") else href
-                results.append({
-                    "external_id": self._make_id(company, title, link),
-                    "title": title, "company": company,
-                    "company_type": "startup",
-                    "location": "India", "work_mode": "hybrid",
-                    "salary_min_lpa": None, "salary_max_lpa": None,
-                    "experience_min": 0, "experience_max": 2,
-                    "description": "", "skills_required": [],
-                    "apply_url": link or self.BASE,
-                    "source": self.source,
-                })
-            except Exception:
-                continue
+        for f in _WELLFOUND_PARSER(html):
+            title, company = f["title"], f["company"]
+            href = f["href"] or ""
+            link = self.BASE + href if href.startswith("/") else href
+            results.append(ScrapedJob(
+                external_id=self._make_id(company, title, link),
+                title=title, company=company,
+                company_type="startup",
+                location="India", work_mode="hybrid",
+                salary_min_lpa=None, salary_max_lpa=None,
+                experience_min=0, experience_max=2,
+                description="", skills_required=[],
+                apply_url=link or self.BASE,
+                source=self.source,
+            ))
         return results
 
 
@@ -320,21 +424,28 @@ class ScraperOrchestrator:
     def __init__(self):
         self.db = Database()
 
+    async def _run_one(self, ScraperClass, results: dict):
+        name = ScraperClass.source
+        scraper = None
+        try:
+            logger.info(f"Running {name}...")
+            scraper = ScraperClass()
+            jobs = await scraper.scrape()
+            saved = scraper.save(jobs)
+            results["by_source"][name] = {"scraped": len(jobs), "saved": saved}
+            results["total"] += len(jobs)
+        except Exception as e:
+            results["errors"].append(f"{name}: {e}")
+            logger.error(f"Scraper {name} failed: {e}")
+        finally:
+            if scraper is not None:
+                await scraper.aclose()
+
     async def run_all(self) -> dict:
         results = {"total": 0, "by_source": {}, "errors": []}
-        for ScraperClass in self.SCRAPERS:
-            name = ScraperClass.source
-            try:
-                logger.info(f"Running {name}...")
-                scraper = ScraperClass()
-                jobs = await scraper.scrape()
-                saved = scraper.save(jobs)
-                results["by_source"][name] = {"scraped": len(jobs), "saved": saved}
-                results["total"] += len(jobs)
-            except Exception as e:
-                results["errors"].append(f"{name}: {e}")
-                logger.error(f"Scraper {name} failed: {e}")
+        # Sources are independent hosts — scrape them concurrently
+        await asyncio.gather(*(self._run_one(cls, results) for cls in self.SCRAPERS))
 
-        self.db.set_pref("last_scrape_time", __import__('datetime').datetime.now().isoformat())
+        self.db.set_pref("last_scrape_time", datetime.now().isoformat())
         logger.info(f"Scraping done: {results['total']} total")
         return results
@@ -1,27 +1,51 @@
-import json
+import asyncio
+import hashlib
 from config.settings import get_settings
-from src.agent.brain.groq_client import GroqClient
+from src.agent.brain import fast_json
+from src.agent.brain.groq_client import get_groq_client
 from src.agent.brain.logger import get_logger
 from src.agent.memory.database import Database
 from src.agent.memory.vector_store import VectorStore
 
 logger = get_logger("matcher")
 
+# Title keywords penalised unless the candidate targets them (checked in order)
+_UNRELATED_ROLES = ("trainer", "sales", "hr", "recruiter", "marketing",
+                    "business development", "bpo", "customer support")
+
+
+def _text_hash(text: str) -> str:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=8).hexdigest()
+
 
 class JobMatcher:
     def __init__(self):
         self.db = Database()
         self.vs = VectorStore()
-        self.llm = GroqClient()
+        self.llm = get_groq_client()
         s = get_settings()
         self.threshold = s.match_threshold
         self.top_n = s.match_top_n
         self.rerank = s.llm_rerank_enabled
         self.rerank_min = s.llm_rerank_min
         self.rerank_max = s.llm_rerank_max
+        # FAISS flush/search run in worker threads; one pass at a time so
+        # nothing mutates the store (add, forget, index promotion) meanwhile
+        self._lock = asyncio.Lock()
 
     async def run(self) -> dict:
-        """Full async matching pipeline."""
+        """Full async matching pipeline (serialized per matcher)."""
+        async with self._lock:
+            return await self._run()
+
+    async def forget_jobs(self, job_ids: list) -> int:
+        """Drop deleted/archived jobs from the vector store and persist it."""
+        async with self._lock:
+            n = self.vs.forget_jobs(job_ids)
+            await asyncio.to_thread(self.vs.flush)
+            return n
+
+    async def _run(self) -> dict:
         logger.info("Starting job matching pipeline...")
 
         # 1. Index unmatched jobs
@@ -29,59 +53,89 @@ class JobMatcher:
         if not unmatched:
             logger.info("No new jobs to index, proceeding to matching...")
         
-        indexed = 0
-        if unmatched:
-            logger.info(f"Embedding {len(unmatched)} new jobs...")
-
+        # Jobs that stayed below threshold come back every run — only embed
+        # the ones whose text changed since they were last indexed, or that
+        # the vector store lost (files deleted, index reset on a dim change)
+        in_store = set(self.vs.id_map.values())
+        stale = []
         for job in unmatched:
             text = self._job_to_text(job)
-            # Use FastEmbed (CPU) via GroqClient wrapper
-            embedding = await self.llm.embed(text)
-            if embedding:
-                self.vs.add_job_vector(job["id"], embedding, {
-                    "title": job["title"], "company": job["company"]
-                })
-                indexed += 1
-
-        self.vs.flush()
+            h = _text_hash(text)
+            if job.get("embed_hash") != h or job["id"] not in in_store:
+                stale.append((job, text, h))
+
+        indexed = 0
+        embedded = []
+        if stale:
+            logger.info(f"Embedding {len(stale)} new jobs...")
+            # One batched embedding pass + one bulk index add, not N round-trips
+            vectors = await self.llm.embed_batch([text for _, text, _ in stale], batch_size=32)
+            if len(vectors) == len(stale):
+                ids = [job["id"] for job, _, _ in stale]
+                self.vs.forget_jobs(ids)  # drop vectors from an older text
+                indexed = self.vs.add_job_vectors(
+                    ids,
+                    vectors,
+                    [{"title": job["title"], "company": job["company"]} for job, _, _ in stale],
+                )
+                embedded = [(job["id"], h) for job, _, h in stale]
+            else:
+                logger.warning("Batch embedding failed — jobs stay unindexed until next run")
+
+        # FAISS persistence and search are blocking — keep them off the event loop
+        await asyncio.to_thread(self.vs.flush)
+        # Only after the flush, so a crash before it re-embeds on the next run
+        self.db.set_embed_hashes(embedded)
         logger.info(f"Indexed {indexed} jobs")
 
         # 2. Match against resume
-        results = self.vs.match_resume(top_k=200)
+        results = await asyncio.to_thread(self.vs.match_resume, 200)
         if not results:
             logger.warning("No vector results — is resume embedded?")
             return {"matched": 0, "indexed": indexed}
 
         # 3. Score, filter, optionally LLM re-rank
-        matched = 0
+        to_save, gaps = [], []
         resume = self.db.get_active_resume()
+        # Constant for the whole pass — build the resume skill set once
+        r_skills = frozenset(
+            s.lower() for s in (resume or {}).get("skills", []) + (resume or {}).get("tech_stack", [])
+        )
+
+        # One IN (...) query for every candidate instead of one lookup per hit
+        results = [r for r in results if r["score"] >= self.threshold - 0.1]
+        jobs_by_id = {j["id"]: j for j in self.db.get_jobs_by_ids([r["job_id"] for r in results])}
+
+        candidates = [
+            (job, self._build_match(job, r["score"], resume, r_skills))
+            for r in results
+            if (job := jobs_by_id.get(r["job_id"]))
+        ]
 
-        for r in results:
-            score = r["score"]
-            if score < (self.threshold - 0.1):
-                continue
-
-            job = self.db.get_job_by_id(r["job_id"])
-            if not job:
-                continue
-
-            match = self._build_match(job, score, resume)
-
-            # LLM re-rank for borderline scores (Groq Cloud)
-            if self.rerank and self.rerank_min <= score <= self.rerank_max:
-                llm_result = await self._llm_rerank(job, score, resume)
+        # LLM re-rank for borderline scores (Groq Cloud). The calls are
+        # independent, so run them together; GroqClient's semaphore and
+        # rate limiter bound how many are actually in flight.
+        if self.rerank:
+            borderline = [(job, m) for job, m in candidates
+                          if self.rerank_min <= m["embed_score"] <= self.rerank_max]
+            reranked = await asyncio.gather(
+                *(self._llm_rerank(job, m["embed_score"], resume) for job, m in borderline)
+            )
+            for (_, match), llm_result in zip(borderline, reranked):
                 if llm_result:
                     match.update(llm_result)
 
-            match["final_score"] = self._final_score(score, match.get("llm_score"))
+        for _, match in candidates:
+            match["final_score"] = self._final_score(match["embed_score"], match.get("llm_score"))
 
             if match["final_score"] >= self.threshold:
-                self.db.save_match(match)
+                to_save.append(match)
                 # Track skill gaps
-                for gap in match.get("skill_gaps", []):
-                    self.db.bump_skill(gap)
-                matched += 1
+                gaps.extend((gap, "none", "general") for gap in match.get("skill_gaps", []))
 
+        # One transaction each for matches and skill gaps, not one per row
+        matched = self.db.save_matches(to_save)
+        self.db.bump_skills_many(gaps)
         logger.info(f"Matched: {matched}")
         return {"matched": matched, "indexed": indexed}
 
@@ -91,28 +145,15 @@ class JobMatcher:
             f"Company: {job.get('company','')}",
             f"Location: {job.get('location','')}",
         ]
-        skills = job.get("skills_required", [])
-        if isinstance(skills, str):
-            try:
-                skills = json.loads(skills)
-            except:
-                skills = []
+        skills = job.get("skills_required") or []  # decoded by Database
         if skills:
             parts.append(f"Skills: {', '.join(skills)}")
         if job.get("description"):
             parts.append(f"Description: {job['description'][:800]}")
         return "\n".join(parts)
 
-    def _build_match(self, job: dict, score: float, resume: dict) -> dict:
-        r_skills = set((s.lower() for s in (resume or {}).get("skills", []) + (resume or {}).get("tech_stack", [])))
-
-        skills_raw = job.get("skills_required", [])
-        if isinstance(skills_raw, str):
-            try:
-                skills_raw = json.loads(skills_raw)
-            except:
-                skills_raw = []
-        j_skills = set(s.lower() for s in skills_raw)
+    def _build_match(self, job: dict, score: float, resume: dict, r_skills: frozenset) -> dict:
+        j_skills = set(s.lower() for s in job.get("skills_required") or [])
 
         overlap = list(r_skills & j_skills)
         gaps = list(j_skills - r_skills)[:6]
@@ -157,8 +198,7 @@ class JobMatcher:
                 return 0.15, f"Matches target role: {role}"
                 
         # 2. Penalty for unrelated roles (unless requested)
-        unrelated = ["trainer", "sales", "hr", "recruiter", "marketing", "business development", "bpo", "customer support"]
-        for bad in unrelated:
+        for bad in _UNRELATED_ROLES:
             if bad in title_lower:
                 # Only penalize if they didn't ask for it
                 if not any(bad in t for t in target_roles):
@@ -184,7 +224,9 @@ Return JSON only:
                 [{"role": "user", "content": prompt}], 
                 json_mode=True
             )
-            result = json.loads(response_text)
+            result = fast_json.loads_lenient(response_text)
+            if not isinstance(result, dict):
+                return {}
             return {
                 "llm_score": result.get("llm_score", score),
                 "llm_reasoning": result.get("reasoning", ""),
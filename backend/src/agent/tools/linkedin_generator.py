@@ -3,13 +3,19 @@ src/agent/tools/linkedin_generator.py
 LLM-driven LinkedIn post generator. No hardcoded templates.
 All posts generated dynamically by Ollama based on candidate profile.
 """
-import json
-from src.agent.brain.groq_client import GroqClient
+import re
+import asyncio
+from src.agent.brain import fast_json
+from src.agent.brain.groq_client import get_groq_client
 from src.agent.brain.logger import get_logger
 from src.agent.memory.database import Database
 
 logger = get_logger("linkedin_gen")
 
+# Case-insensitive substring signals used by _predict_engagement
+_ENGAGE_BUILD = re.compile(r"built|learned|project|achieved", re.I)
+_ENGAGE_CTA = re.compile(r"dm|connect|comment|share", re.I)
+
 POST_TYPES = {
     "open_to_work": "Open to work announcement targeting recruiters",
     "skill_spotlight": "Deep-dive post about a specific technical skill or project",
@@ -22,7 +28,7 @@ POST_TYPES = {
 
 class LinkedInGenerator:
     def __init__(self):
-        self.llm = GroqClient()
+        self.llm = get_groq_client()
         self.db = Database()
 
     async def generate(self, post_type: str = "open_to_work",
@@ -59,11 +65,14 @@ RULES:
 
 Write ONLY the post content, nothing else:"""
 
-        content = await self.llm.chat([{"role": "user", "content": prompt}], temperature=0.75)
+        # Hashtags don't depend on the post body — request both at once
+        content, hashtags = await asyncio.gather(
+            self.llm.chat([{"role": "user", "content": prompt}], temperature=0.75),
+            self._generate_hashtags(post_type, roles, topic),
+        )
         if not content or len(content) < 50:
             content = await self._fallback_post(post_type, roles, skills, name)
 
-        hashtags = await self._generate_hashtags(post_type, roles, topic)
         hook = content.split("\n")[0][:120] if content else ""
         engagement = self._predict_engagement(content)
 
@@ -92,7 +101,7 @@ Return ONLY a JSON array of hashtag strings starting with #:
 
         try:
             response = await self.llm.chat([{"role": "user", "content": prompt}], json_mode=True)
-            result = json.loads(response)
+            result = fast_json.loads_lenient(response)
             if isinstance(result, list):
                 return result[:10]
             if isinstance(result, dict) and "hashtags" in result:
@@ -114,14 +123,13 @@ Type: {post_type}. Make it authentic and professional. No hashtags."""
     def _predict_engagement(self, content: str) -> str:
         score = 0
         if "?" in content: score += 2
-        if any(w in content.lower() for w in ["built", "learned", "project", "achieved"]): score += 2
+        if _ENGAGE_BUILD.search(content): score += 2
         if len(content) > 150: score += 1
-        if any(w in content.lower() for w in ["dm", "connect", "comment", "share"]): score += 1
+        if _ENGAGE_CTA.search(content): score += 1
         return "high" if score >= 5 else ("medium" if score >= 3 else "low")
 
     async def generate_weekly_batch(self) -> list:
         """Generate one of each post type for the week."""
-        results = []
         resume = self.db.get_active_resume()
         roles = resume.get("target_roles", ["AI Engineer","Data Analyst"]) if resume else ["AI Engineer"]
 
@@ -132,13 +140,12 @@ Type: {post_type}. Make it authentic and professional. No hashtags."""
             ("learning_update", roles[0] if roles else "AI Engineer", "RAG Pipelines"),
             ("achievement_story", roles[0] if roles else "Python Developer", None),
         ]
-        results = []
-        
-        # Sequentially generate to avoid rate limits on free tier
-        for ptype, role, topic in tasks:
-            post = await self.generate(post_type=ptype, target_role=role, topic=topic)
-            results.append(post)
-            import asyncio
-            await asyncio.sleep(1) # Polite delay
-            
-        return results
+        # Two posts in flight at a time; GroqClient's rate limiter keeps the
+        # free tier happy, so no fixed sleep between posts is needed
+        sem = asyncio.Semaphore(2)
+
+        async def _one(ptype, role, topic):
+            async with sem:
+                return await self.generate(post_type=ptype, target_role=role, topic=topic)
+
+        return list(await asyncio.gather(*(_one(*t) for t in tasks)))
@@ -3,22 +3,65 @@ src/agent/tools/resume_analyzer.py
 Fully dynamic resume analysis via Ollama LLM.
 No hardcoded skill lists — LLM extracts everything from the actual resume.
 """
-import json
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
 from pathlib import Path
-from typing import Optional
-from src.agent.brain.groq_client import GroqClient
+from typing import Iterable, List, Tuple
+import numpy as np
+from src.agent.brain import fast_json
+from src.agent.brain.groq_client import get_groq_client
 from src.agent.brain.logger import get_logger
+from src.agent.brain.schemas import RESUME_ANALYSIS_SCHEMA, ResumeAnalysis
+from src.agent.brain.tokens import truncate_list, truncate_tokens
 from src.agent.memory.database import Database
 from src.agent.memory.vector_store import VectorStore
 
 logger = get_logger("resume_analyzer")
 
+_MAX_RESUME_CHARS = 8000  # extraction cap; prompts use the token budget below
+_RESUME_PROMPT_TOKENS = 1500
+_SKILL_LIST_TOKENS = 80  # per skill list in the gap report prompt
+_GAP_REPORT_TTL = 300  # seconds
+_GAP_REPORT_CACHE_SIZE = 8
+
+
+_W_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+
+def _docx_paragraphs(path: Path) -> Iterable[str]:
+    """
+    Stream paragraph text straight from word/document.xml — skips building
+    python-docx's Paragraph/Run objects. Lazy, so _take can stop early.
+    """
+    import zipfile
+    from lxml import etree
+    with zipfile.ZipFile(path) as z, z.open("word/document.xml") as f:
+        for _, p in etree.iterparse(f, events=("end",), tag=f"{_W_NS}p"):
+            yield "".join(t.text or "" for t in p.iter(f"{_W_NS}t"))
+            p.clear()
+
+
+def _take(chunks: Iterable[str], max_chars: int) -> str:
+    """Join pages/paragraphs lazily, stopping once `max_chars` are collected."""
+    buf: List[str] = []
+    total = 0
+    for chunk in chunks:
+        buf.append(chunk)
+        total += len(chunk) + 1
+        if total >= max_chars:
+            break
+    return "\n".join(buf)
+
 
 class ResumeAnalyzer:
     def __init__(self):
-        self.llm = GroqClient()
+        self.llm = get_groq_client()
         self.db = Database()
         self.vs = VectorStore()
+        # (profile, top gap set) -> (expires_at, report)
+        self._gap_reports: "OrderedDict[tuple, Tuple[float, str]]" = OrderedDict()
 
     async def analyze(self, file_path: str = None, raw_text: str = None) -> dict:
         """
@@ -31,14 +74,15 @@ class ResumeAnalyzer:
             text = raw_text
             filename = "pasted_text"
         elif file_path:
-            text = self._extract_text(Path(file_path))
+            # PDF/DOCX parsing is CPU-bound; run it off the event loop
+            text = await asyncio.to_thread(self._extract_text, Path(file_path))
             filename = Path(file_path).name
         else:
             # Try default path from env
             from config.settings import get_settings
             default = Path(get_settings().sqlite_path).parent / "resume.pdf"
             if default.exists():
-                text = self._extract_text(default)
+                text = await asyncio.to_thread(self._extract_text, default)
                 filename = default.name
             else:
                 logger.warning("No resume provided. Using empty profile.")
@@ -50,16 +94,23 @@ class ResumeAnalyzer:
 
         logger.info(f"Analyzing resume: {filename} ({len(text)} chars)")
 
-        # 2. LLM extraction — let the model figure out everything
-        extracted = await self._llm_extract(text)
-        if not extracted:
-            extracted = {}
+        # 2. LLM extraction + skill gaps vs. job market — one call, cached
+        # by resume content so re-uploading the same file skips the LLM
+        text_hash = hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+        cached = self.db.get_cached_analysis(text_hash)
+        if cached:
+            logger.info("Resume unchanged — reusing cached analysis")
+            extracted, gaps = cached["profile"], cached["gaps"]
+        else:
+            extracted, gaps = await self._llm_extract_and_gaps(text)
+            if extracted:
+                self.db.save_cached_analysis(text_hash, extracted, gaps)
 
         extracted["filename"] = filename
         extracted["raw_text"] = text
 
-        # 3. Identify skill gaps by comparing to job market
-        gaps = await self._identify_gaps(extracted)
+        # 3. Record skill gaps
+        self._record_gaps(gaps)
         extracted["market_gaps"] = gaps
 
         # 4. Save to DB
@@ -67,153 +118,148 @@ class ResumeAnalyzer:
         logger.info(f"Resume saved. Skills: {len(extracted.get('skills', []))}")
 
         # 5. Generate and save embedding — using FastEmbed (CPU)
-        embed_text = self._build_embed_text(extracted)
-        if not embed_text.strip():
+        sections = self._build_embed_sections(extracted)
+        if not sections:
             # Fallback: embed raw resume text so job matching always works
-            embed_text = text[:2000]
-            
-        embedding = await self.llm.embed(embed_text)
-        if embedding:
-            self.vs.save_resume_vector(embedding)
+            sections = [text[:2000]]
+
+        # All sections in one batched request, mean-pooled into the resume vector
+        vectors = await self.llm.embed_batch(sections)
+        if len(vectors) == len(sections):
+            vectors /= np.linalg.norm(vectors, axis=1, keepdims=True) + 1e-12
+            self.vs.save_resume_vector(vectors.mean(axis=0))
         else:
             logger.warning("Embedding failed")
 
         return extracted
 
-    async def _llm_extract(self, text: str) -> Optional[dict]:
-        """Use Groq to extract structured data from resume text."""
-        prompt = f"""Analyze this resume and extract all information. Return ONLY valid JSON.
+    async def _llm_extract_and_gaps(self, text: str) -> Tuple[dict, list]:
+        """
+        One Groq call that extracts the structured profile AND the market
+        skill gaps, so the resume is only sent (and prefilled) once.
+        Returns (profile, gaps).
+        """
+        prompt = f"""Analyze this resume for the Indian tech job market 2025. Return JSON.
 
 RESUME TEXT:
-{text[:3500]}
-
-Return this exact JSON structure (fill all fields based on the resume):
-{{
-  "name": "candidate full name",
-  "email": "email if found",
-  "phone": "phone if found",
-  "skills": ["skill1", "skill2", ...],
-  "tech_stack": ["Python", "SQL", ...],
-  "experience_years": 0,
-  "education": {{
-    "degree": "B.Tech",
-    "branch": "Computer Science",
-    "college": "college name",
-    "graduation_year": 2025,
-    "cgpa": 8.5
-  }},
-  "projects": [
-    {{
-      "name": "project name",
-      "description": "what it does",
-      "tech": ["Python", "ML"]
-    }}
-  ],
-  "certifications": ["cert1", "cert2"],
-  "industry_tags": ["Machine Learning", "Data Analytics"],
-  "target_roles": ["AI Engineer", "Data Analyst"],
-  "strengths": ["strength1", "strength2"],
-  "summary": "2 sentence professional summary",
-  "experience_level": "fresher"
-}}"""
+{truncate_tokens(text, _RESUME_PROMPT_TOKENS)}
+
+1. "profile": extract all information from the resume (fill all fields).
+2. "gaps": as a career advisor, list the TOP 10 skills this candidate should
+   learn to get hired faster in India for their target roles and level.
+   Focus on skills actively demanded in Indian job postings right now, and
+   don't list skills they already have."""
 
         try:
-            response = await self.llm.chat([{"role": "user", "content": prompt}], json_mode=True)
-            return json.loads(response)
+            response = await self.llm.chat(
+                [{"role": "user", "content": prompt}],
+                schema=RESUME_ANALYSIS_SCHEMA, schema_name="resume_analysis",
+            )
+            data = fast_json.loads_lenient(response)
+            if not isinstance(data, dict):
+                raise ValueError(f"no JSON object in reply: {(response or '')[:80]!r}")
+            result = ResumeAnalysis.model_validate(data)
         except Exception as e:
             logger.error(f"Resume extraction failed: {e}")
-            return {}
-
-    async def _identify_gaps(self, profile: dict) -> list:
-        """Dynamically find skill gaps by asking LLM about market trends."""
-        skills = profile.get("skills", []) + profile.get("tech_stack", [])
-        target_roles = profile.get("target_roles", ["Software Developer"])
+            return {}, []
+        return result.profile.model_dump(), [g.model_dump() for g in result.gaps]
 
-        prompt = f"""You are a career advisor for Indian tech job market 2025.
+    def _record_gaps(self, gaps: list):
+        """Save the market gaps to the skill_gaps table in one transaction."""
+        self.db.bump_skills_many(
+            [(gap.get("skill",""), "none", gap.get("category","general")) for gap in gaps]
+        )
 
-This candidate has these skills: {", ".join(skills[:20])}
-They are targeting: {", ".join(target_roles[:3])}
-Experience: {profile.get('experience_level', 'fresher')}
-
-What are the TOP 10 skills they should learn to get hired faster in India?
-Focus on skills actively demanded in Indian job postings right now.
-
-Return ONLY valid JSON:
-{{
-  "gaps": [
-    {{"skill": "LangChain", "priority": "high", "category": "ai", "reason": "why important"}},
-    ...
-  ]
-}}"""
-
-        try:
-            response = await self.llm.chat([{"role": "user", "content": prompt}], json_mode=True)
-            result = json.loads(response)
-            
-            if result and "gaps" in result:
-                # Save each gap to DB
-                for gap in result["gaps"]:
-                    self.db.bump_skill(
-                        gap.get("skill",""),
-                        level="none",
-                        category=gap.get("category","general")
-                    )
-                return result["gaps"]
-        except:
-            return []
-        return []
-
-    def _extract_text(self, path: Path) -> str:
-        """Extract plain text from PDF, DOCX, or TXT."""
+    def _extract_text(self, path: Path, max_chars: int = _MAX_RESUME_CHARS) -> str:
+        """
+        Extract plain text from PDF, DOCX, or TXT. Stops reading pages once
+        `max_chars` are collected — the LLM only sees ~1500 tokens anyway.
+        """
         suffix = path.suffix.lower()
         try:
             if suffix == ".txt":
-                return path.read_text(encoding="utf-8", errors="ignore")
+                with open(path, encoding="utf-8", errors="ignore") as f:
+                    return f.read(max_chars)
             elif suffix == ".pdf":
                 try:
                     import pypdf
                     reader = pypdf.PdfReader(str(path))
-                    return "\n".join(p.extract_text() or "" for p in reader.pages)
+                    return _take((p.extract_text() or "" for p in reader.pages), max_chars)
                 except ImportError:
-                    import pdfminer.high_level
-                    return pdfminer.high_level.extract_text(str(path))
+                    from pdfminer.high_level import extract_pages
+                    from pdfminer.layout import LTTextContainer
+                    pages = (
+                        "".join(el.get_text() for el in page if isinstance(el, LTTextContainer))
+                        for page in extract_pages(str(path))
+                    )
+                    return _take(pages, max_chars)
             elif suffix in [".docx", ".doc"]:
+                try:
+                    return _take(_docx_paragraphs(path), max_chars)
+                except Exception as e:
+                    logger.warning(f"Raw DOCX parse failed ({e}), falling back to python-docx")
                 import docx
                 doc = docx.Document(str(path))
-                return "\n".join(p.text for p in doc.paragraphs)
+                return _take((p.text for p in doc.paragraphs), max_chars)
         except Exception as e:
             logger.error(f"Text extraction failed for {path}: {e}")
         return ""
 
-    def _build_embed_text(self, data: dict) -> str:
-        """Build rich text for embedding — combines key resume signals."""
-        parts = []
+    def _build_embed_sections(self, data: dict) -> List[str]:
+        """
+        Build the texts to embed — one per resume section (profile, skills,
+        projects), so each signal gets its own vector before pooling.
+        """
+        profile = []
         if data.get("summary"):
-            parts.append(data["summary"])
+            profile.append(data["summary"])
         if data.get("industry_tags"):
-            parts.append(f"Domains: {', '.join(data['industry_tags'])}")
-        if data.get("skills"):
-            parts.append(f"Skills: {', '.join(data['skills'][:20])}")
-        if data.get("tech_stack"):
-            parts.append(f"Tech: {', '.join(data['tech_stack'][:15])}")
+            profile.append(f"Domains: {', '.join(data['industry_tags'])}")
         if data.get("target_roles"):
-            parts.append(f"Seeking: {', '.join(data['target_roles'])}")
+            profile.append(f"Seeking: {', '.join(data['target_roles'])}")
         if data.get("experience_level"):
-            parts.append(f"Level: {data['experience_level']} 2025 graduate")
-        return "\n".join(parts)
+            profile.append(f"Level: {data['experience_level']} 2025 graduate")
+
+        skills = []
+        if data.get("skills"):
+            skills.append(f"Skills: {', '.join(data['skills'][:20])}")
+        if data.get("tech_stack"):
+            skills.append(f"Tech: {', '.join(data['tech_stack'][:15])}")
 
-    async def get_gap_report(self) -> str:
-        """Generate a natural language skill gap report via LLM."""
+        projects = [
+            f"Project: {p.get('name', '')} — {p.get('description', '')} ({', '.join(p.get('tech') or [])})"
+            for p in (data.get("projects") or [])[:5] if isinstance(p, dict)
+        ]
+        return ["\n".join(part) for part in (profile, skills, projects) if part]
+
+    async def get_gap_report(self, gaps: List[dict] = None) -> str:
+        """
+        Generate a natural language skill gap report via LLM.
+        Pass `gaps` (get_skill_gaps rows, 12+) if the caller already has them.
+        """
         resume = self.db.get_active_resume()
-        gaps = self.db.get_skill_gaps(12)
+        if gaps is None:
+            gaps = self.db.get_skill_gaps(12)
 
         if not resume:
             return "No resume analyzed yet. Please upload your resume first."
 
+        # Gap frequencies reshuffle after every matching run; keyed on the
+        # top-8 *set* so a reorder doesn't cost a fresh generation
+        key = (
+            tuple(resume.get("skills", [])[:15]),
+            tuple(resume.get("tech_stack", [])[:10]),
+            tuple(resume.get("target_roles", [])[:3]),
+            frozenset(g["skill_name"] for g in gaps[:8]),
+        )
+        hit = self._gap_reports.get(key)
+        if hit and hit[0] > time.monotonic():
+            return hit[1]
+
         prompt = f"""Create a skill gap analysis report for this Indian tech fresher (2025).
 
-Their skills: {", ".join(resume.get("skills", [])[:15])}
-Their tech stack: {", ".join(resume.get("tech_stack", [])[:10])}
+Their skills: {truncate_list(resume.get("skills", [])[:15], _SKILL_LIST_TOKENS)}
+Their tech stack: {truncate_list(resume.get("tech_stack", [])[:10], _SKILL_LIST_TOKENS)}
 Top missing skills from job market: {", ".join(g["skill_name"] for g in gaps[:8])}
 Target roles: {", ".join(resume.get("target_roles", [])[:3])}
 
@@ -225,4 +271,10 @@ Write a helpful, actionable report with:
 
 Keep it practical, 300 words max."""
 
-        return await self.llm.chat([{"role": "user", "content": prompt}])
+        report = await self.llm.chat([{"role": "user", "content": prompt}])
+        if report:
+            self._gap_reports[key] = (time.monotonic() + _GAP_REPORT_TTL, report)
+            self._gap_reports.move_to_end(key)
+            if len(self._gap_reports) > _GAP_REPORT_CACHE_SIZE:
+                self._gap_reports.popitem(last=False)
+        return report
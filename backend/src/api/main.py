@@ -5,26 +5,28 @@ Echo career agent API
 """
 from __future__ import annotations
 import asyncio
-import json
+import re
+import secrets
 import time
-import uuid
 from datetime import datetime
+from functools import cached_property
 from pathlib import Path
 from typing import Optional
 
+import aiofiles
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, UploadFile, File, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import StreamingResponse, JSONResponse
 from pydantic import BaseModel
 
 from config.settings import get_settings
-from src.agent.brain.groq_client import GroqClient
+from src.agent.brain import fast_json
+from src.agent.brain.groq_client import get_groq_client
 from src.agent.brain.logger import get_logger
+from src.agent.brain.ratelimit import UpstreamUnavailable
+from src.agent.brain.intent_batcher import IntentBatcher
+from src.agent.brain.schemas import Intent
 from src.agent.memory.database import Database
-from src.agent.tools.resume_analyzer import ResumeAnalyzer
-from src.agent.tools.job_matcher import JobMatcher
-from src.agent.tools.linkedin_generator import LinkedInGenerator
-from src.agent.scrapers.job_scraper import ScraperOrchestrator
 
 logger = get_logger("api")
 s = get_settings()
@@ -45,11 +47,87 @@ app.add_middleware(
 
 # ── Singletons ───────────────────────────────────────────────
 db = Database()
-groq = GroqClient()
-analyzer = ResumeAnalyzer()
-matcher = JobMatcher()
-post_gen = LinkedInGenerator()
-scraper = ScraperOrchestrator()
+groq = get_groq_client()
+intent_batcher = IntentBatcher(groq)
+
+class Services:
+    """
+    Tool singletons, built on first use. Their modules pull in numpy/FAISS/
+    bs4 and load the vector index, so importing them here would delay the
+    port bind and raise baseline RSS for endpoints that never touch them.
+    """
+
+    @cached_property
+    def analyzer(self):
+        from src.agent.tools.resume_analyzer import ResumeAnalyzer
+        return ResumeAnalyzer()
+
+    @cached_property
+    def matcher(self):
+        from src.agent.tools.job_matcher import JobMatcher
+        return JobMatcher()
+
+    @cached_property
+    def post_gen(self):
+        from src.agent.tools.linkedin_generator import LinkedInGenerator
+        return LinkedInGenerator()
+
+    @cached_property
+    def scraper(self):
+        from src.agent.scrapers.job_scraper import ScraperOrchestrator
+        return ScraperOrchestrator()
+
+svc = Services()
+
+# Chat history is written off the request path: handlers enqueue rows and a
+# single writer task commits them in batches (one transaction per batch)
+HISTORY_Q: asyncio.Queue = asyncio.Queue()
+_HISTORY_BATCH = 32
+_HISTORY_WAIT = 0.2  # seconds
+
+async def history_writer():
+    loop = asyncio.get_running_loop()
+    while True:
+        rows = [await HISTORY_Q.get()]
+        deadline = loop.time() + _HISTORY_WAIT
+        while len(rows) < _HISTORY_BATCH:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                rows.append(await asyncio.wait_for(HISTORY_Q.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        try:
+            await asyncio.to_thread(db.save_messages, rows)
+        except Exception as e:
+            logger.error("History write failed (%d rows): %s", len(rows), e)
+
+def _flush_history():
+    rows = []
+    while not HISTORY_Q.empty():
+        rows.append(HISTORY_Q.get_nowait())
+    if rows:
+        db.save_messages(rows)
+
+_history_task: Optional[asyncio.Task] = None
+
+@app.on_event("startup")
+async def _startup():
+    global _history_task
+    _history_task = asyncio.create_task(history_writer())
+
+@app.on_event("shutdown")
+async def _shutdown():
+    if _history_task:
+        _history_task.cancel()
+    _flush_history()  # don't lose the last turns on shutdown
+    await groq.aclose()
+
+@app.exception_handler(UpstreamUnavailable)
+async def _upstream_unavailable(request, exc: UpstreamUnavailable):
+    logger.error("Upstream unavailable: %s", exc)
+    return JSONResponse({"error": "AI provider is rate-limited, try again shortly"}, status_code=503)
 
 # ── CHAT SYSTEM PROMPT ───────────────────────────────────────
 ECHO_SYSTEM = """You are Echo the chat bot, an intelligent career AI agent created by Manthan
@@ -83,97 +161,196 @@ class PostGenRequest(BaseModel):
 
 # ── TOOL ROUTER ──────────────────────────────────────────────
 
+# Keyword fast-path: plain read-only commands skip the classifier LLM
+# round-trip. Patterns are anchored to an imperative at the start, so chat
+# that merely mentions a job or a post goes to the LLM. Anything with side
+# effects (scrape, post generation) is always classified by the LLM.
+_INTENT_PATTERNS = {
+    re.compile(r"^\s*(show|list|find|get)( me)?\b.*\b(jobs?|matches|openings)\b", re.I): "show_jobs",
+    re.compile(r"^\s*((show|list|get)( me)?\b.*\bskill ?gaps?\b|what should i learn\b)", re.I): "skill_gaps",
+    re.compile(r"^\s*(show|get)( me)?\b.*\b(stats|statistics)\b", re.I): "show_stats",
+}
+# Qualifiers the tool handlers take as params (work mode, company type,
+# limit) — only the LLM extracts those, so their presence disables the fast path
+_INTENT_QUALIFIERS = re.compile(
+    r"\b(remote|hybrid|on-?site|wfh|work from home|startups?|mncs?|mid[- ]?size|\d+)\b", re.I
+)
+
+
+def _fast_intent(message: str) -> Optional[Intent]:
+    """Return the intent when exactly one pattern matches a param-free command."""
+    if _INTENT_QUALIFIERS.search(message):
+        return None
+    hits = [action for pattern, action in _INTENT_PATTERNS.items() if pattern.search(message)]
+    if len(hits) != 1:
+        return None
+    return Intent(action=hits[0], params={})
+
+
 async def route_to_tool(message: str, session_id: str) -> Optional[dict]:
     """
-    Use LLM to determine if message needs a tool call.
-    Returns tool result or None (for pure chat).
+    Use keywords (or the LLM when they're ambiguous) to determine if message
+    needs a tool call. Returns tool result or None (for pure chat).
     """
-    intent_prompt = f"""Classify this user message into one of these actions or 'chat':
-
-Message: "{message}"
-
-Actions:
-- show_jobs: user wants to see job matches
-- explain_job: user asks about a specific job (extract job_id if mentioned)
-- skill_gaps: user asks about missing skills or what to learn
-- generate_post: user wants a LinkedIn post
-- run_scrape: user wants to start job scraping now
-- upload_resume: user mentions resume
-- show_stats: user wants agent statistics
-- set_preference: user wants to change role/location/settings
-- weekly_posts: user wants all post types generated
-- chat: general question, career advice, other
-
-Return JSON only:
-{{"action": "show_jobs", "params": {{}}}}"""
-
-    result = await groq.extract_json(intent_prompt)
-    if not result:
+    intent = _fast_intent(message)
+    if intent is None:
+        intent = await intent_batcher.submit(message)
+    if intent is None:
+        return None
+
+    handler = _TOOL_HANDLERS.get(intent.action)  # "chat"/"upload_resume" have none
+    if handler is None:
         return None
+    return await handler(intent.params or {})
 
-    action = result.get("action", "chat")
-    params = result.get("params", {})
-
-    if action == "show_jobs":
-        jobs = db.get_top_matches(
-            limit=params.get("limit", 10),
-            work_mode=params.get("work_mode"),
-            company_type=params.get("company_type"),
-        )
-        return {"type": "jobs", "data": jobs}
-
-    elif action == "explain_job":
-        job_id = params.get("job_id")
-        if job_id:
-            explanation = await matcher.explain(int(job_id))
-            return {"type": "explanation", "data": explanation}
-
-    elif action == "skill_gaps":
-        gaps = db.get_skill_gaps(12)
-        report = await analyzer.get_gap_report()
-        return {"type": "skill_gaps", "data": {"gaps": gaps, "report": report}}
-
-    elif action == "generate_post":
-        post = await post_gen.generate(
-            post_type=params.get("post_type", "open_to_work"),
-            target_role=params.get("target_role"),
-            topic=params.get("topic"),
-        )
-        return {"type": "linkedin_post", "data": post}
-
-    elif action == "run_scrape":
-        asyncio.create_task(_run_scrape_background())
-        return {"type": "info", "data": "Scraping started in background! This takes 3-5 minutes. I'll update you when done."}
-
-    elif action == "show_stats":
-        stats = db.get_stats()
-        return {"type": "stats", "data": stats}
-
-    elif action == "set_preference":
-        key = params.get("key","")
-        val = params.get("value")
-        if key and val:
-            db.set_pref(key, val)
-            return {"type": "info", "data": f"Preference updated: {key} = {val}"}
-
-    elif action == "weekly_posts":
-        posts = await post_gen.generate_weekly_batch()
-        return {"type": "weekly_posts", "data": posts}
 
+async def _tool_show_jobs(params: dict) -> Optional[dict]:
+    jobs = db.get_top_matches(
+        limit=params.get("limit", 10),
+        work_mode=params.get("work_mode"),
+        company_type=params.get("company_type"),
+    )
+    return {"type": "jobs", "data": jobs}
+
+async def _tool_explain_job(params: dict) -> Optional[dict]:
+    job_id = params.get("job_id")
+    if job_id:
+        explanation = await svc.matcher.explain(int(job_id))
+        return {"type": "explanation", "data": explanation}
     return None
 
+async def _tool_skill_gaps(params: dict) -> Optional[dict]:
+    gaps = db.get_skill_gaps(12)
+    report = await svc.analyzer.get_gap_report(gaps)  # reuse, don't re-query
+    return {"type": "skill_gaps", "data": {"gaps": gaps, "report": report}}
+
+async def _tool_generate_post(params: dict) -> Optional[dict]:
+    post = await svc.post_gen.generate(
+        post_type=params.get("post_type", "open_to_work"),
+        target_role=params.get("target_role"),
+        topic=params.get("topic"),
+    )
+    return {"type": "linkedin_post", "data": post}
+
+async def _tool_run_scrape(params: dict) -> Optional[dict]:
+    asyncio.create_task(_run_scrape_background())
+    return {"type": "info", "data": "Scraping started in background! This takes 3-5 minutes. I'll update you when done."}
+
+async def _tool_show_stats(params: dict) -> Optional[dict]:
+    stats = db.get_stats()
+    return {"type": "stats", "data": stats}
+
+async def _tool_set_preference(params: dict) -> Optional[dict]:
+    key = params.get("key","")
+    val = params.get("value")
+    if key and val:
+        db.set_pref(key, val)
+        return {"type": "info", "data": f"Preference updated: {key} = {val}"}
+    return None
+
+async def _tool_weekly_posts(params: dict) -> Optional[dict]:
+    posts = await svc.post_gen.generate_weekly_batch()
+    return {"type": "weekly_posts", "data": posts}
+
+_TOOL_HANDLERS = {
+    "show_jobs": _tool_show_jobs,
+    "explain_job": _tool_explain_job,
+    "skill_gaps": _tool_skill_gaps,
+    "generate_post": _tool_generate_post,
+    "run_scrape": _tool_run_scrape,
+    "show_stats": _tool_show_stats,
+    "set_preference": _tool_set_preference,
+    "weekly_posts": _tool_weekly_posts,
+}
+
+
+# ── TOOL RESULT RENDERERS ────────────────────────────────────
+# Short plain-text views of tool results for the follow-up LLM prompt —
+# a few lines of text are far fewer prompt tokens than the raw JSON.
+
+def _render_jobs(jobs: list) -> str:
+    if not jobs:
+        return "No job matches yet."
+    lines = []
+    for i, j in enumerate(jobs[:5], 1):
+        salary = f" — {j['salary_max_lpa']:g} LPA" if j.get("salary_max_lpa") else ""
+        lines.append(f"{i}. {j.get('title','')} at {j.get('company','')}{salary} ({j.get('final_score', 0):.0%} match)")
+    return f"Top {len(lines)} of {len(jobs)} jobs:\n" + "\n".join(lines)
+
+
+def _render_skill_gaps(data: dict) -> str:
+    skills = [g.get("skill_name", "") for g in data.get("gaps", [])[:8]]
+    return "Most requested missing skills: " + (", ".join(skills) or "none")
+
+
+def _render_stats(stats: dict) -> str:
+    return (f"{stats.get('total_jobs', 0)} active jobs, {stats.get('total_matched', 0)} matches "
+            f"(avg score {stats.get('avg_score', 0):.2f}), {stats.get('total_posts', 0)} posts generated")
+
+
+def _render_explanation(text: str) -> str:
+    return (text or "")[:400]
+
+
+RENDERERS = {
+    "jobs": _render_jobs,
+    "skill_gaps": _render_skill_gaps,
+    "stats": _render_stats,
+    "explanation": _render_explanation,
+}
+
+# Follow-up instructions per tool type, built once at import. Sent as their
+# own system message so the per-call text is only the rendered result.
+TOOL_SYSTEM_PROMPTS = {
+    "jobs": "Above are the user's top job matches. Summarize them naturally in 1-2 sentences.",
+    "skill_gaps": "Above are the user's skill gaps. Suggest what to learn first in 1-2 sentences.",
+    "stats": "Above are the agent's statistics. Summarize them naturally in 1 sentence.",
+    "explanation": "Above is an assessment of one job. Give the takeaway in 1-2 sentences.",
+}
+
+# Results the user can read as-is — no follow-up LLM summary
+_SELF_EXPLANATORY = frozenset({"info", "linkedin_post", "weekly_posts"})
+
 
 async def _run_scrape_background():
     """Background task: scrape → match → report."""
     try:
-        await scraper.run_all()
-        await matcher.run()
+        await svc.scraper.run_all()
+        # Same guard as uploads: joins (or queues a rerun of) any match in flight
+        await _start_matching()
         db.set_pref("last_cycle_time", datetime.now().isoformat())
         logger.info("Background scrape+match cycle complete")
     except Exception as e:
         logger.error(f"Background cycle failed: {e}")
 
 
+_match_task: Optional[asyncio.Task] = None
+_match_rerun = False  # a newer resume arrived while a match was running
+
+async def _run_match_background():
+    """Background task: re-match jobs against the current resume until no rerun is pending."""
+    global _match_rerun
+    while True:
+        _match_rerun = False
+        try:
+            await svc.matcher.run()
+            db.set_pref("last_match_time", datetime.now().isoformat())
+            logger.info("Background match complete")
+        except Exception as e:
+            logger.error(f"Background match failed: {e}")
+        if not _match_rerun:
+            break
+
+def _start_matching() -> asyncio.Task:
+    """Start (or queue a rerun of) the background match; returns its task."""
+    global _match_task, _match_rerun
+    if _match_task is None or _match_task.done():
+        _match_task = asyncio.create_task(_run_match_background())
+    else:
+        _match_rerun = True  # the running task picks this up when it finishes
+    return _match_task
+
+
 # ── API ROUTES ───────────────────────────────────────────────
 
 @app.get("/")
@@ -206,9 +383,22 @@ async def set_model(body: dict):
     return {"model": groq.model}
 
 # Chat — streaming SSE
+# Events are framed straight to bytes. Text chunks (one per flush, the bulk
+# of every response) use short keys: {"t": "x", "c": chunk}.
+_SSE_PREFIX = b"data: "
+_SSE_SUFFIX = b"\n\n"
+
+def _sse(event: dict) -> bytes:
+    return _SSE_PREFIX + fast_json.dumps_bytes(event) + _SSE_SUFFIX
+
+def _sse_text(chunk: str) -> bytes:
+    return _SSE_PREFIX + fast_json.dumps_bytes({"t": "x", "c": chunk}) + _SSE_SUFFIX
+
+_SSE_DONE = _sse({"type": "done"})
+
 @app.post("/api/chat/stream")
 async def chat_stream(req: ChatRequest):
-    session_id = req.session_id or str(uuid.uuid4())
+    session_id = req.session_id or secrets.token_hex(16)
 
     async def generate():
         # Check for tool call first
@@ -216,31 +406,39 @@ async def chat_stream(req: ChatRequest):
 
         if tool_result:
             # Stream tool result as JSON event
-            yield f"data: {json.dumps({'type': 'tool', 'result': tool_result})}\n\n"
+            yield _sse({"type": "tool", "result": tool_result})
+            render = RENDERERS.get(tool_result["type"])
+            if tool_result["type"] in _SELF_EXPLANATORY or render is None:
+                yield _SSE_DONE
+                return
             # Also generate natural language summary
             history = db.get_history(session_id, 6)
             msgs = [{"role": m["role"], "content": m["content"]} for m in history]
             msgs.append({"role": "user", "content": req.message})
 
-            summary_prompt = f"The tool returned this result: {json.dumps(tool_result)[:500]}. Summarize it naturally in 1-2 sentences."
-            async for chunk in groq.stream_chat(msgs, system=ECHO_SYSTEM + f"\n{summary_prompt}"):
-                yield f"data: {json.dumps({'type': 'text', 'chunk': chunk})}\n\n"
+            # Keep the system prompt byte-identical across turns so the provider
+            # can reuse its prefix cache; the per-call tool context goes last.
+            msgs.append({"role": "system", "content": render(tool_result["data"])})
+            msgs.append({"role": "system", "content": TOOL_SYSTEM_PROMPTS[tool_result["type"]]})
+            async for chunk in groq.stream_chat(msgs, system=ECHO_SYSTEM):
+                yield _sse_text(chunk)
         else:
             # Pure chat with history
             history = db.get_history(session_id, 10)
             msgs = [{"role": m["role"], "content": m["content"]} for m in history]
             msgs.append({"role": "user", "content": req.message})
 
-            full_response = ""
+            parts = []
             async for chunk in groq.stream_chat(msgs, system=ECHO_SYSTEM):
-                full_response += chunk
-                yield f"data: {json.dumps({'type': 'text', 'chunk': chunk})}\n\n"
+                parts.append(chunk)
+                yield _sse_text(chunk)
+            full_response = "".join(parts)
 
             # Save to history
-            db.save_message(session_id, "user", req.message)
-            db.save_message(session_id, "assistant", full_response)
+            HISTORY_Q.put_nowait((session_id, "user", req.message, ""))
+            HISTORY_Q.put_nowait((session_id, "assistant", full_response, ""))
 
-        yield f"data: {json.dumps({'type': 'done'})}\n\n"
+        yield _SSE_DONE
 
     return StreamingResponse(generate(), media_type="text/event-stream",
                               headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
@@ -248,7 +446,7 @@ async def chat_stream(req: ChatRequest):
 # Non-streaming chat
 @app.post("/api/chat")
 async def chat(req: ChatRequest):
-    session_id = req.session_id or str(uuid.uuid4())
+    session_id = req.session_id or secrets.token_hex(16)
     tool_result = await route_to_tool(req.message, session_id)
 
     if tool_result:
@@ -268,8 +466,8 @@ async def chat(req: ChatRequest):
     chat_msgs = [{"role": "system", "content": ECHO_SYSTEM}] + msgs
     response = await groq.chat(chat_msgs)
 
-    db.save_message(session_id, "user", req.message)
-    db.save_message(session_id, "assistant", response)
+    HISTORY_Q.put_nowait((session_id, "user", req.message, ""))
+    HISTORY_Q.put_nowait((session_id, "assistant", response, ""))
 
     return {"session_id": session_id, "text": response, "tool_result": None}
 
@@ -283,16 +481,27 @@ async def upload_resume(file: UploadFile = File(...)):
 
     save_path = Path("data/uploads") / file.filename
     save_path.parent.mkdir(parents=True, exist_ok=True)
-    content = await file.read()
-    save_path.write_bytes(content)
+    # Stream to disk in 64 KB chunks instead of holding the whole file in RAM
+    limit = s.upload_max_mb << 20
+    total = 0
+    async with aiofiles.open(save_path, "wb") as out:
+        while chunk := await file.read(1 << 16):
+            total += len(chunk)
+            if total > limit:
+                break
+            await out.write(chunk)
+    if total > limit:
+        save_path.unlink(missing_ok=True)
+        raise HTTPException(413, f"File too large (max {s.upload_max_mb} MB)")
+
+    result = await svc.analyzer.analyze(file_path=str(save_path))
+
+    # Match in the background; clients poll /api/agent/status for completion
+    _start_matching()
 
-    result = await analyzer.analyze(file_path=str(save_path))
-    
-    # Trigger matching immediately
-    await matcher.run()
-    
     return {
         "success": True,
+        "matching": "started",
         "filename": file.filename,
         "skills_found": len(result.get("skills", [])),
         "name": result.get("name", ""),
@@ -309,9 +518,14 @@ async def get_jobs(limit: int = 20, min_score: float = 0.5,
                                work_mode=work_mode, company_type=company_type)
     return {"jobs": jobs, "total": len(jobs)}
 
+@app.get("/api/jobs/search")
+async def search_jobs(q: str, limit: int = 20):
+    jobs = db.search_jobs(q, limit=limit)
+    return {"jobs": jobs, "total": len(jobs)}
+
 @app.get("/api/jobs/{job_id}/explain")
 async def explain_job(job_id: int):
-    explanation = await matcher.explain(job_id)
+    explanation = await svc.matcher.explain(job_id)
     return {"job_id": job_id, "explanation": explanation}
 
 @app.post("/api/agent/run")
@@ -319,6 +533,13 @@ async def run_agent():
     asyncio.create_task(_run_scrape_background())
     return {"status": "started", "message": "Agent cycle started in background"}
 
+@app.get("/api/agent/status")
+async def agent_status():
+    return {
+        "matching": _match_task is not None and not _match_task.done(),
+        "last_match_time": db.get_pref("last_match_time"),
+    }
+
 @app.post("/api/agent/pause")
 async def pause_agent():
     db.set_pref("agent_paused", True)
@@ -332,7 +553,7 @@ async def resume_agent():
 # LinkedIn posts
 @app.post("/api/posts/generate")
 async def generate_post(req: PostGenRequest):
-    post = await post_gen.generate(
+    post = await svc.post_gen.generate(
         post_type=req.post_type,
         target_role=req.target_role,
         topic=req.topic,
@@ -341,7 +562,7 @@ async def generate_post(req: PostGenRequest):
 
 @app.post("/api/posts/weekly")
 async def weekly_posts():
-    posts = await post_gen.generate_weekly_batch()
+    posts = await svc.post_gen.generate_weekly_batch()
     return {"posts": posts}
 
 @app.get("/api/posts")
@@ -351,9 +572,9 @@ async def get_posts(limit: int = 10):
 # Skills
 @app.get("/api/skills/gaps")
 async def skill_gaps(limit: int = 15):
-    gaps = db.get_skill_gaps(limit)
-    report = await analyzer.get_gap_report()
-    return {"gaps": gaps, "report": report}
+    gaps = db.get_skill_gaps(max(limit, 12))  # one query serves both
+    report = await svc.analyzer.get_gap_report(gaps)
+    return {"gaps": gaps[:limit], "report": report}
 
 @app.get("/api/resume")
 async def get_resume():
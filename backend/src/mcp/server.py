@@ -3,15 +3,16 @@ src/mcp/server.py
 MCP (Model Context Protocol) server for Echo.
 Exposes career agent tools to any MCP-compatible client (Claude Desktop, etc.)
 """
-import json
 import asyncio
 import sys
+import threading
 from datetime import datetime
 from src.agent.memory.database import Database
 from src.agent.tools.job_matcher import JobMatcher
 from src.agent.tools.resume_analyzer import ResumeAnalyzer
 from src.agent.tools.linkedin_generator import LinkedInGenerator
 from src.agent.scrapers.job_scraper import ScraperOrchestrator
+from src.agent.brain import fast_json
 from src.agent.brain.logger import get_logger
 
 logger = get_logger("mcp")
@@ -112,6 +113,21 @@ class EchoMCPServer:
         self.analyzer = ResumeAnalyzer()
         self.post_gen = LinkedInGenerator()
         self.scraper = ScraperOrchestrator()
+        self._handlers = {
+            "get_top_jobs": self._h_top_jobs,
+            "explain_job_match": self._h_explain_job,
+            "get_skill_gaps": self._h_skill_gaps,
+            "generate_linkedin_post": self._h_linkedin_post,
+            "scrape_jobs": self._h_scrape,
+            "run_matching": self._h_matching,
+            "get_agent_stats": self._h_stats,
+            "get_resume": self._h_resume,
+            "set_preference": self._h_set_preference,
+        }
+        self._write_lock = threading.Lock()
+        # Requests run concurrently; one scrape at a time (matching is
+        # already serialized by JobMatcher's own lock)
+        self._scrape_lock = asyncio.Lock()
 
     async def handle_request(self, request: dict) -> dict:
         method = request.get("method","")
@@ -141,7 +157,7 @@ class EchoMCPServer:
             return {
                 "jsonrpc": "2.0", "id": req_id,
                 "result": {
-                    "content": [{"type": "text", "text": json.dumps(result, indent=2)}]
+                    "content": [{"type": "text", "text": fast_json.dumps(result)}]
                 }
             }
 
@@ -152,75 +168,123 @@ class EchoMCPServer:
 
     async def _call_tool(self, name: str, args: dict) -> dict:
         """Dispatch tool calls to agent functions."""
+        handler = self._handlers.get(name)
+        if handler is None:
+            return {"error": f"Unknown tool: {name}"}
         try:
-            if name == "get_top_jobs":
-                jobs = self.db.get_top_matches(
-                    limit=args.get("limit", 10),
-                    min_score=args.get("min_score", 0.55),
-                    work_mode=args.get("work_mode"),
-                    company_type=args.get("company_type"),
-                )
-                return {"jobs": jobs, "count": len(jobs)}
-
-            elif name == "explain_job_match":
-                explanation = await self.matcher.explain(args["job_id"])
-                return {"explanation": explanation}
-
-            elif name == "get_skill_gaps":
-                gaps = self.db.get_skill_gaps(args.get("limit", 10))
-                report = await self.analyzer.get_gap_report()
-                return {"gaps": gaps, "report": report}
-
-            elif name == "generate_linkedin_post":
-                post = await self.post_gen.generate(
-                    post_type=args.get("post_type","open_to_work"),
-                    target_role=args.get("target_role"),
-                    topic=args.get("topic"),
-                )
-                return post
-
-            elif name == "scrape_jobs":
-                result = await self.scraper.run_all()
-                return result
-
-            elif name == "run_matching":
-                result = await self.matcher.run()
-                return result
-
-            elif name == "get_agent_stats":
-                return self.db.get_stats()
-
-            elif name == "get_resume":
-                resume = self.db.get_active_resume()
-                return resume or {"error": "No resume uploaded"}
-
-            elif name == "set_preference":
-                self.db.set_pref(args["key"], args["value"])
-                return {"success": True, "key": args["key"], "value": args["value"]}
-
-            else:
-                return {"error": f"Unknown tool: {name}"}
-
+            return await handler(args)
         except Exception as e:
             logger.error(f"Tool {name} error: {e}")
             return {"error": str(e)}
 
+    # ── Tool handlers (one per entry in TOOLS) ──────────────
+
+    async def _h_top_jobs(self, args: dict) -> dict:
+        jobs = self.db.get_top_matches(
+            limit=args.get("limit", 10),
+            min_score=args.get("min_score", 0.55),
+            work_mode=args.get("work_mode"),
+            company_type=args.get("company_type"),
+        )
+        return {"jobs": jobs, "count": len(jobs)}
+
+    async def _h_explain_job(self, args: dict) -> dict:
+        explanation = await self.matcher.explain(args["job_id"])
+        return {"explanation": explanation}
+
+    async def _h_skill_gaps(self, args: dict) -> dict:
+        limit = args.get("limit", 10)
+        gaps = self.db.get_skill_gaps(max(limit, 12))  # one query serves both
+        report = await self.analyzer.get_gap_report(gaps)
+        return {"gaps": gaps[:limit], "report": report}
+
+    async def _h_linkedin_post(self, args: dict) -> dict:
+        return await self.post_gen.generate(
+            post_type=args.get("post_type","open_to_work"),
+            target_role=args.get("target_role"),
+            topic=args.get("topic"),
+        )
+
+    async def _h_scrape(self, args: dict) -> dict:
+        async with self._scrape_lock:
+            return await self.scraper.run_all()
+
+    async def _h_matching(self, args: dict) -> dict:
+        return await self.matcher.run()  # serialized by JobMatcher's lock
+
+    async def _h_stats(self, args: dict) -> dict:
+        return self.db.get_stats()
+
+    async def _h_resume(self, args: dict) -> dict:
+        resume = self.db.get_active_resume()
+        return resume or {"error": "No resume uploaded"}
+
+    async def _h_set_preference(self, args: dict) -> dict:
+        self.db.set_pref(args["key"], args["value"])
+        return {"success": True, "key": args["key"], "value": args["value"]}
+
+    async def _stdin_reader(self) -> asyncio.StreamReader:
+        """
+        Event-loop-native stdin reader (no thread hop per JSON-RPC frame).
+        Raises NotImplementedError/ValueError where stdin can't be a pipe
+        transport (Windows proactor loop, regular files).
+        """
+        loop = asyncio.get_running_loop()
+        reader = asyncio.StreamReader(limit=2 ** 22)  # tool args can be large
+        await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+        return reader
+
     async def run_stdio(self):
         """Run MCP server over stdio (JSON-RPC 2.0)."""
         logger.info("Echo MCP Server starting on stdio...")
+        try:
+            reader = await self._stdin_reader()
+            readline = reader.readline
+        except (NotImplementedError, ValueError, OSError):
+            loop = asyncio.get_running_loop()
+            readline = lambda: loop.run_in_executor(None, sys.stdin.buffer.readline)
+        # stdout carries only JSON-RPC frames (logs go to stderr); each frame
+        # is one locked write, so concurrent replies never interleave
+        pending = set()
         while True:
             try:
-                line = await asyncio.get_event_loop().run_in_executor(None, sys.stdin.readline)
+                line = await readline()
                 if not line:
                     break
-                request = json.loads(line.strip())
-                response = await self.handle_request(request)
-                print(json.dumps(response), flush=True)
-            except json.JSONDecodeError as e:
-                error = {"jsonrpc":"2.0","id":None,"error":{"code":-32700,"message":str(e)}}
-                print(json.dumps(error), flush=True)
+                try:
+                    request = fast_json.loads(line)
+                except ValueError as e:  # json and orjson decode errors
+                    error = {"jsonrpc":"2.0","id":None,"error":{"code":-32700,"message":str(e)}}
+                    self._write(error)
+                    continue
+                # Don't let a slow tool (scrape_jobs) hold up the next request;
+                # responses carry their id, so out-of-order replies are fine
+                task = asyncio.create_task(self._serve(request))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
             except Exception as e:
                 logger.error(f"MCP error: {e}")
+        if pending:
+            await asyncio.gather(*pending)
+
+    def _write(self, message: dict):
+        """Write one JSON-RPC frame to stdout in a single call."""
+        frame = fast_json.dumps(message) + "\n"
+        with self._write_lock:
+            sys.stdout.write(frame)
+            sys.stdout.flush()
+
+    async def _serve(self, request: dict):
+        try:
+            response = await self.handle_request(request)
+        except Exception as e:
+            logger.error(f"MCP error: {e}")
+            req_id = request.get("id") if isinstance(request, dict) else None
+            if req_id is None:
+                return  # notification — nobody is waiting on a reply
+            response = {"jsonrpc": "2.0", "id": req_id,
+                        "error": {"code": -32603, "message": str(e)}}
+        self._write(response)
 
 
 async def main():
@@ -34,6 +34,11 @@ export async function uploadResume(file) {
     return r.json()
 }
 
+export async function getAgentStatus() {
+    const r = await fetch(`${BASE}/api/agent/status`)
+    return r.json()
+}
+
 export async function getSkillGaps() {
     const r = await fetch(`${BASE}/api/skills/gaps`)
     return r.json()
@@ -96,7 +101,8 @@ export function streamChat(message, sessionId, onChunk, onToolResult, onDone, on
                 if (!raw || raw === '[DONE]') continue
                 try {
                     const data = JSON.parse(raw)
-                    if (data.type === 'text') onChunk(data.chunk)
+                    if (data.t === 'x') onChunk(data.c)
+                    else if (data.type === 'text') onChunk(data.chunk)
                     else if (data.type === 'tool') onToolResult(data.result)
                     else if (data.type === 'done') { onDone(); return }
                     else if (data.type === 'error') { onError(data.message); return }
@@ -1,5 +1,5 @@
 import { useState, useEffect, useCallback, useRef } from 'react'
-import { getResume, uploadResume, getSkillGaps } from '../api.js'
+import { getResume, uploadResume, getSkillGaps, getAgentStatus } from '../api.js'
 
 export default function ResumePanel({ toast, active }) {
     const [resume, setResume] = useState(null)
@@ -27,6 +27,12 @@ export default function ResumePanel({ toast, active }) {
             await load()
         } catch { toast('Upload failed', 'error') }
         finally { setUploading(false) }
+        // Matching runs in the background — refresh gaps once it finishes
+        for (let i = 0; i < 30; i++) {
+            await new Promise(r => setTimeout(r, 2000))
+            try { if (!(await getAgentStatus()).matching) break } catch { break }
+        }
+        load()
     }
 
     const onDrop = (e) => {